@@ -0,0 +1,133 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+
+from flask import Response, make_response, request
+
+# Response headers that are recomputed on every hit rather than replayed from the cache
+_VOLATILE_HEADERS = {"content-length", "content-type", "x-cache"}
+
+
+class ResponseCache:
+    """
+    In-process read-through cache of serialized JSON responses.
+
+    Entries are keyed on the route and its normalized query parameters, evicted
+    LRU-first once `max_entries` is reached and expired after `ttl` seconds.
+    The whole cache is dropped when the scrape generation changes; the marker is
+    polled at most once every `check_interval` seconds so a cache hit never pays
+    a MongoDB round trip.
+    """
+
+    def __init__(self, generation_loader, max_entries=256, ttl=3600, check_interval=30):
+        self.generation_loader = generation_loader
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.check_interval = check_interval
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._generation = None
+        self._checked_at = 0.0
+        self._invalidation_callbacks = []
+
+    @classmethod
+    def from_env(cls, generation_loader):
+        """Builds a cache sized from CACHE_MAX_ENTRIES / CACHE_TTL_SECONDS / CACHE_GENERATION_CHECK_SECONDS."""
+        return cls(
+            generation_loader,
+            max_entries=int(os.getenv("CACHE_MAX_ENTRIES", 256)),
+            ttl=float(os.getenv("CACHE_TTL_SECONDS", 3600)),
+            check_interval=float(os.getenv("CACHE_GENERATION_CHECK_SECONDS", 30)),
+        )
+
+    def on_invalidate(self, callback):
+        """Registers `callback` to run whenever a new scrape generation drops the cache."""
+        self._invalidation_callbacks.append(callback)
+
+    @staticmethod
+    def key_for(path, args):
+        """Normalizes a route and its (name, value) query pairs into a cache key (path + sorted, stripped args)."""
+        return path, tuple(sorted((name, value.strip()) for name, value in args if value.strip()))
+
+    @classmethod
+    def make_key(cls):
+        """Cache key of the current Flask request."""
+        return cls.key_for(request.path, request.args.items(multi=True))
+
+    @staticmethod
+    def cacheable_headers(headers):
+        """The response headers worth replaying on a hit, as (name, value) pairs."""
+        return [(name, value) for name, value in headers if name.lower() not in _VOLATILE_HEADERS]
+
+    def refresh_generation(self):
+        """Drops the cache (and notifies listeners) when the scrape generation has moved on."""
+        now = time.monotonic()
+        if self._generation is not None and now - self._checked_at < self.check_interval:
+            return
+        try:
+            generation = self.generation_loader()
+        except Exception as e:
+            print(f"⚠️ Could not read scrape generation, keeping cached data: {e}")
+            self._checked_at = now
+            return
+        with self._lock:
+            changed = generation != self._generation
+            if changed:
+                self._entries.clear()
+                self._generation = generation
+            self._checked_at = now
+        if changed:
+            for callback in self._invalidation_callbacks:
+                callback()
+
+    def get(self, key):
+        self.refresh_generation()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            value, stored_at = entry
+            if time.monotonic() - stored_at > self.ttl:
+                del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (value, time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def cached(self, view):
+        """Route decorator: serves 200 JSON responses from memory, caching them on a miss."""
+
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            key = self.make_key()
+            entry = self.get(key)
+            if entry is not None:
+                body, headers = entry
+                response = Response(body, status=200, headers=headers, mimetype="application/json")
+                response.headers["X-Cache"] = "HIT"
+                return response
+
+            response = make_response(view(*args, **kwargs))
+            if response.status_code == 200 and not response.is_streamed:
+                self.set(key, (response.get_data(), self.cacheable_headers(response.headers.items())))
+            response.headers["X-Cache"] = "MISS"
+            return response
+
+        return wrapper
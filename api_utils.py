@@ -0,0 +1,374 @@
+import base64
+import json
+from datetime import datetime, timezone
+from urllib.parse import urlencode
+
+from bson import ObjectId, json_util
+from flask import Response, jsonify, request, stream_with_context
+
+import metrics
+from geo import point
+from serialization import INTERNAL_FIELDS, dumps
+from snapshots import TRUE_VALUES
+from stats import shape_stats, stats_pipeline
+
+# Fields a client may ask for with `fields=`
+PUBLIC_FIELDS = ("name", "start_date", "end_date", "mode", "location", "prize_money", "apply_link", "source",
+                 "sources", "apply_links", "city", "country", "geo")
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+STREAM_BATCH_SIZE = 500
+STREAM_FORMATS = ("ndjson", "json-stream")
+STREAM_MIMETYPES = {"ndjson": "application/x-ndjson", "json-stream": "application/json"}
+STREAM_DELIMITERS = {"ndjson": ("", ""), "json-stream": ("[", "]")}
+
+# `prize_money=` comparison prefixes
+PRIZE_OPERATORS = {">=": "$gte", "<=": "$lte", ">": "$gt", "<": "$lt"}
+
+# `radius=` of /hackathons/nearby, in km
+DEFAULT_NEARBY_RADIUS_KM = 50
+MAX_NEARBY_RADIUS_KM = 1000
+
+# Keyset order used for cursor pagination
+SORT_ORDER = [("start_date", 1), ("_id", 1)]
+
+
+def encode_cursor(doc):
+    """Encodes the keyset position (start_date, _id) of `doc` as an opaque URL-safe token."""
+    raw = json_util.dumps([doc.get("start_date"), doc["_id"]])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token):
+    """Inverse of `encode_cursor`. Raises ValueError on a malformed token."""
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        start_date, last_id = json_util.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+    except Exception:
+        raise ValueError("Invalid cursor")
+    if not isinstance(last_id, ObjectId):
+        raise ValueError("Invalid cursor")
+    return start_date, last_id
+
+
+def encode_offset_cursor(offset):
+    """Cursor for ranked, in-memory result lists (e.g. search), where keyset order does not apply."""
+    return base64.urlsafe_b64encode(json.dumps({"offset": offset}).encode()).decode().rstrip("=")
+
+
+def decode_offset_cursor(token):
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        offset = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())["offset"]
+    except Exception:
+        raise ValueError("Invalid cursor")
+    if not isinstance(offset, int) or offset < 0:
+        raise ValueError("Invalid cursor")
+    return offset
+
+
+def keyset_filter(start_date, last_id):
+    """Matches documents strictly after (start_date, _id) in SORT_ORDER."""
+    if start_date is None:
+        # null sorts before every other value, so everything with a start date comes later
+        return {"$or": [
+            {"start_date": None, "_id": {"$gt": last_id}},
+            {"start_date": {"$ne": None}},
+        ]}
+    return {"$or": [
+        {"start_date": {"$gt": start_date}},
+        {"start_date": start_date, "_id": {"$gt": last_id}},
+    ]}
+
+
+def parse_date_param(value, name):
+    """Parses a YYYY-MM-DD query parameter into the datetime stored in MongoDB."""
+    try:
+        return datetime.strptime(value.strip(), "%Y-%m-%d")
+    except ValueError:
+        raise ValueError(f"Invalid {name} value, expected YYYY-MM-DD")
+
+
+def parse_limit(args):
+    """Returns the requested page size, or None when the client did not ask for paging."""
+    limit = args.get("limit")
+    if limit is None:
+        return DEFAULT_PAGE_SIZE if args.get("cursor") else None
+    try:
+        limit = int(limit)
+    except ValueError:
+        raise ValueError("Invalid limit value")
+    if not 1 <= limit <= MAX_PAGE_SIZE:
+        raise ValueError(f"limit must be between 1 and {MAX_PAGE_SIZE}")
+    return limit
+
+
+def parse_fields(args):
+    """Returns the list of requested fields, or None for all fields."""
+    fields = args.get("fields")
+    if not fields:
+        return None
+    requested = [field.strip() for field in fields.split(",") if field.strip()]
+    unknown = [field for field in requested if field not in PUBLIC_FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+    return requested
+
+
+def build_projection(fields, with_keyset=False):
+    """MongoDB projection for `fields`; keyset paging also needs start_date and _id."""
+    if fields is None:
+        hidden = INTERNAL_FIELDS[1:] if with_keyset else INTERNAL_FIELDS
+        return {field: 0 for field in hidden}
+    projection = {field: 1 for field in fields}
+    if with_keyset:
+        projection["start_date"] = 1
+    else:
+        projection["_id"] = 0
+    return projection
+
+
+def _strip(doc, fields):
+    """Drops the bookkeeping fields a client did not ask for."""
+    doc.pop("_id", None)
+    if fields is not None and "start_date" not in fields:
+        doc.pop("start_date", None)
+    return doc
+
+
+def _project(doc, fields):
+    """Copy of `doc` limited to `fields`, leaving shared (in-memory) documents untouched."""
+    if fields is None:
+        return {key: value for key, value in doc.items() if key not in INTERNAL_FIELDS}
+    return {field: doc[field] for field in fields if field in doc}
+
+
+def next_page_headers(base_url, args, next_cursor):
+    """Link / X-Next-Cursor headers pointing at the next page; `args` are the request's (name, value) pairs."""
+    if not next_cursor:
+        return {}
+    query = [(name, value) for name, value in args if name != "cursor"] + [("cursor", next_cursor)]
+    return {"Link": f'<{base_url}?{urlencode(query)}>; rel="next"', "X-Next-Cursor": next_cursor}
+
+
+def stream_item(doc, fmt, fields, position):
+    """One chunk of a streamed response: an NDJSON line or a JSON array element."""
+    if fmt == "ndjson":
+        return dumps(_strip(doc, fields)) + "\n"
+    return ("," if position else "") + dumps(_strip(doc, fields))
+
+
+def stream_docs(docs, fmt, fields):
+    opening, closing = STREAM_DELIMITERS[fmt]
+    yield opening
+    for position, doc in enumerate(docs):
+        yield stream_item(doc, fmt, fields, position)
+    yield closing
+
+
+def parse_format(args):
+    fmt = args.get("format")
+    if fmt is not None and fmt not in STREAM_FORMATS:
+        raise ValueError(f"format must be one of: {', '.join(STREAM_FORMATS)}")
+    return fmt
+
+
+def _with_next_link(response, next_cursor):
+    response.headers.update(next_page_headers(request.base_url, request.args.items(multi=True), next_cursor))
+    return response
+
+
+def serialize_docs(docs):
+    """JSON body of a result list, timed as the request's serialization stage."""
+    metrics.record_items(len(docs))
+    with metrics.stage("serialize"):
+        return dumps(docs)
+
+
+def json_body_response(docs):
+    return Response(serialize_docs(docs), mimetype="application/json")
+
+
+class FindPlan:
+    """
+    The find() a request translates to, independent of the web framework and
+    of whether the collection is sync (PyMongo) or async (AsyncMongoClient):
+    - `fields=a,b`: projection to the listed fields
+    - `limit=N` / `cursor=...`: keyset pagination on (start_date, _id)
+    - `format=ndjson|json-stream`: stream straight from the MongoDB cursor
+
+    Raises ValueError for invalid parameters.
+    """
+
+    def __init__(self, filters, args):
+        self.fields = parse_fields(args)
+        self.limit = parse_limit(args)
+        self.format = parse_format(args)
+        self.paging = self.limit is not None
+
+        token = args.get("cursor")
+        if token:
+            filters = {"$and": [filters, keyset_filter(*decode_cursor(token))]}
+        self.filters = filters
+        self.projection = build_projection(self.fields, with_keyset=self.paging)
+
+    def find(self, collection):
+        """Opens the cursor; a page fetches one extra document to know whether another page follows."""
+        cursor = collection.find(self.filters, self.projection)
+        if self.format:
+            cursor = cursor.batch_size(STREAM_BATCH_SIZE)
+        if self.paging:
+            cursor = cursor.sort(SORT_ORDER).limit(self.limit if self.format else self.limit + 1)
+        return cursor
+
+    def page(self, docs):
+        """Returns (client-facing docs, next cursor token or None) for the fetched documents."""
+        next_cursor = None
+        if self.paging:
+            next_cursor = encode_cursor(docs[self.limit - 1]) if len(docs) > self.limit else None
+            docs = docs[:self.limit]
+        return [_strip(doc, self.fields) for doc in docs], next_cursor
+
+
+def find_response(collection, filters, args):
+    """Runs `filters` against `collection` and builds the response (see FindPlan for the parameters)."""
+    plan = FindPlan(filters, args)
+    cursor = plan.find(collection)
+
+    if plan.format:
+        return Response(stream_with_context(stream_docs(cursor, plan.format, plan.fields)),
+                        mimetype=STREAM_MIMETYPES[plan.format])
+
+    docs, next_cursor = plan.page(list(cursor))
+    return _with_next_link(json_body_response(docs), next_cursor)
+
+
+def page_list(docs, args):
+    """
+    Applies the `find_response` parameters to an already ranked in-memory list.
+    Cursors here are plain offsets into the list. Returns (page, next cursor, format).
+    """
+    fields = parse_fields(args)
+    limit = parse_limit(args)
+    fmt = parse_format(args)
+
+    token = args.get("cursor")
+    offset = decode_offset_cursor(token) if token else 0
+    end = offset + limit if limit is not None else len(docs)
+    page = [_project(doc, fields) for doc in docs[offset:end]]
+    next_cursor = encode_offset_cursor(end) if end < len(docs) else None
+    return page, next_cursor, fmt
+
+
+def list_response(docs, args):
+    """Same parameters as `find_response`, for an already ranked in-memory list."""
+    page, next_cursor, fmt = page_list(docs, args)
+    if fmt:
+        return Response(stream_docs(page, fmt, None), mimetype=STREAM_MIMETYPES[fmt])
+    return _with_next_link(json_body_response(page), next_cursor)
+
+
+def stats_json(result):
+    """JSON body of /hackathons/stats for a stats_pipeline result, timed as the serialization stage."""
+    with metrics.stage("serialize"):
+        return dumps(shape_stats(result))
+
+
+def stats_response(collection, filters):
+    """Aggregates the hackathons matching `filters` for /hackathons/stats."""
+    result = list(collection.aggregate(stats_pipeline(filters)))
+    return Response(stats_json(result), mimetype="application/json")
+
+
+def facet_filters(args):
+    """MongoDB filters for the `mode=`, `source=` and `upcoming=` parameters of the list endpoint."""
+    filters = {}
+    if args.get("mode"):
+        filters["mode"] = args["mode"].strip()
+    if args.get("source"):
+        source = args["source"].strip()
+        filters["$or"] = [{"source": source}, {"sources": source}]
+    if args.get("upcoming", "").strip().lower() in TRUE_VALUES:
+        today = datetime.now(timezone.utc)
+        filters["start_date"] = {"$gte": datetime(today.year, today.month, today.day)}
+    return filters
+
+
+def parse_prize_filter(value):
+    """Parses a `prize_money` filter such as ">=5000" into a MongoDB condition."""
+    operator = value[:2] if value[:2] in (">=", "<=") else value[:1]
+    try:
+        amount = int(value[len(operator):].strip())
+    except ValueError:
+        raise ValueError("Invalid prize_money value")
+    if operator not in PRIZE_OPERATORS:
+        raise ValueError("Invalid prize_money format")
+    return {PRIZE_OPERATORS[operator]: amount}
+
+
+def filter_params(args):
+    """MongoDB filters for the date, mode, location and prize parameters of the filter endpoint."""
+    filters = {}
+    if args.get("start_date"):
+        filters["start_date"] = {"$gte": parse_date_param(args["start_date"], "start_date")}
+    if args.get("end_date"):
+        filters["end_date"] = {"$lte": parse_date_param(args["end_date"], "end_date")}
+    if args.get("mode"):
+        filters["mode"] = args["mode"]
+    if args.get("location"):
+        filters["location"] = args["location"]
+    if args.get("prize_money"):
+        filters["prize_money"] = parse_prize_filter(args["prize_money"])
+    return filters
+
+
+def _parse_number(args, name, low, high, default=None):
+    value = args.get(name, "").strip()
+    if not value:
+        if default is None:
+            raise ValueError(f"Missing {name} value")
+        return default
+    try:
+        number = float(value)
+    except ValueError:
+        raise ValueError(f"Invalid {name} value")
+    if not low <= number <= high:
+        raise ValueError(f"{name} must be between {low} and {high}")
+    return number
+
+
+def nearby_params(args):
+    """
+    MongoDB filters for /hackathons/nearby: hackathons within `radius` km (default 50) of
+    `lat`/`lon`, nearest first, plus the date, mode, location and prize filters.
+    """
+    lat = _parse_number(args, "lat", -90, 90)
+    lon = _parse_number(args, "lon", -180, 180)
+    radius = _parse_number(args, "radius", 0, MAX_NEARBY_RADIUS_KM, DEFAULT_NEARBY_RADIUS_KM)
+    filters = filter_params(args)
+    filters["geo"] = {"$nearSphere": {"$geometry": point(lat, lon), "$maxDistance": radius * 1000}}
+    return filters
+
+
+def nearby_cursor(collection, filters, args):
+    """
+    find() for /hackathons/nearby with `limit` (default DEFAULT_PAGE_SIZE) and `fields`.
+    Results come nearest first rather than in keyset order, so there is no `cursor=`.
+    """
+    limit = parse_limit(args) or DEFAULT_PAGE_SIZE
+    return collection.find(filters, build_projection(parse_fields(args))).limit(limit)
+
+
+def nearby_response(collection, filters, args):
+    return json_body_response(list(nearby_cursor(collection, filters, args)))
+
+
+def snapshot_response(snapshot):
+    """Serves a published snapshot, negotiating the content coding and answering If-None-Match."""
+    status, body, headers = snapshot.reply(request.headers.get("Accept-Encoding"), request.headers.get("If-None-Match"))
+    return Response(body, status=status, headers=headers, mimetype="application/json")
+
+
+def error_response(message, status=400):
+    return jsonify({"error": message}), status
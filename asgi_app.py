@@ -0,0 +1,297 @@
+"""
+Async (ASGI) serving mode of the API.
+
+Same routes, parameters and responses as FlaskApi.py, on PyMongo's
+AsyncMongoClient: a worker keeps many MongoDB round trips in flight on one
+event loop instead of blocking a whole worker on each of them.
+
+    uvicorn asgi_app:app --host 0.0.0.0 --port 10000 --workers 2
+"""
+import asyncio
+import contextlib
+import os
+import time
+
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse, Response, StreamingResponse
+from starlette.routing import Route
+
+from api_cache import ResponseCache
+from api_utils import (STREAM_DELIMITERS, STREAM_MIMETYPES, FindPlan, build_projection, facet_filters, filter_params,
+                       nearby_cursor, nearby_params, next_page_headers, page_list, serialize_docs, stats_json, stream_docs,
+                       stream_item)
+from mongo_utils import close_async_client, get_async_db, get_generation_async, get_mongo_uri
+from search_index import SearchIndex
+from snapshots import SNAPSHOT_COLLECTION, Snapshot, snapshot_name
+from stats import stats_pipeline
+import metrics
+
+# ✅ Validate MongoDB settings up front; each worker connects lazily on its first request
+get_mongo_uri()
+
+# ✅ Time every MongoDB command (and log slow ones) from the first connection on
+metrics.install_mongo_listener()
+
+
+class GenerationWatcher:
+    """
+    Polls the scrape generation marker at most once every `check_interval`
+    seconds without blocking the event loop; the response cache reads `value`.
+    """
+
+    def __init__(self, check_interval):
+        self.check_interval = check_interval
+        self.value = None
+        self._checked_at = 0.0
+
+    async def poll(self):
+        now = time.monotonic()
+        if self.value is not None and now - self._checked_at < self.check_interval:
+            return
+        self._checked_at = now
+        try:
+            self.value = await get_generation_async(get_async_db())
+        except Exception as e:
+            print(f"⚠️ Could not read scrape generation, keeping cached data: {e}")
+
+
+class AsyncLazy:
+    """
+    A value built by the coroutine `load` on first use and dropped on every invalidation.
+    A load that returns None is not kept, so the next call tries again.
+    """
+
+    def __init__(self, load):
+        self.load = load
+        self.value = None
+        self._lock = asyncio.Lock()
+
+    def invalidate(self):
+        self.value = None
+
+    async def get(self):
+        if self.value is None:
+            async with self._lock:
+                if self.value is None:
+                    self.value = await self.load()
+        return self.value
+
+
+async def load_search_index():
+    docs = await get_async_db().hackathons.find({}, build_projection(None)).to_list(None)
+    return await asyncio.to_thread(SearchIndex, docs)
+
+
+async def load_snapshots():
+    try:
+        return {stored["_id"]: Snapshot(stored) async for stored in get_async_db()[SNAPSHOT_COLLECTION].find({})}
+    except Exception as e:
+        print(f"⚠️ Could not load snapshots, falling back to queries: {e}")
+        return None  # retried on the next request, like SnapshotStore.get
+
+
+# ✅ Response cache, invalidated whenever a scrape run bumps the generation marker
+generation = GenerationWatcher(float(os.getenv("CACHE_GENERATION_CHECK_SECONDS", 30)))
+cache = ResponseCache.from_env(lambda: generation.value)
+cache.check_interval = 0  # the watcher already throttles the MongoDB reads
+
+# ✅ Search index and snapshots, rebuilt after every scrape run
+search_index = AsyncLazy(load_search_index)
+snapshots = AsyncLazy(load_snapshots)
+cache.on_invalidate(search_index.invalidate)
+cache.on_invalidate(snapshots.invalidate)
+metrics.register_cache(cache)
+
+
+class MetricsMiddleware:
+    """Per-route latency, MongoDB / serialization split and response sizes (see FlaskApi.py)."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        timer = metrics.start_request("unmatched", scope["method"])
+        response = {"status": 500, "size": 0}
+
+        async def send_and_measure(message):
+            if message["type"] == "http.response.start":
+                response["status"] = message["status"]
+            elif message["type"] == "http.response.body":
+                response["size"] += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_and_measure)
+        finally:
+            # routes have no path parameters, so a matched path is its route
+            timer.route = scope["path"] if "endpoint" in scope else "unmatched"
+            timer.finish(response["status"], response["size"])
+
+
+def error_response(message, status=400):
+    return JSONResponse({"error": message}, status_code=status)
+
+
+def json_response(docs, request, next_cursor=None):
+    base_url = str(request.url.replace(query=""))
+    headers = next_page_headers(base_url, request.query_params.multi_items(), next_cursor)
+    return Response(serialize_docs(docs), media_type="application/json", headers=headers)
+
+
+async def cached(request, view):
+    """Serves 200 JSON responses from the response cache, caching them on a miss (ResponseCache.cached)."""
+    await generation.poll()
+    key = ResponseCache.key_for(request.url.path, request.query_params.multi_items())
+    entry = cache.get(key)
+    if entry is not None:
+        body, headers = entry
+        response = Response(body, media_type="application/json", headers=dict(headers))
+        response.headers["X-Cache"] = "HIT"
+        return response
+
+    response = await view(request)
+    if response.status_code == 200 and not isinstance(response, StreamingResponse):
+        cache.set(key, (response.body, cache.cacheable_headers(response.headers.items())))
+    response.headers["X-Cache"] = "MISS"
+    return response
+
+
+async def stream_cursor(cursor, plan):
+    opening, closing = STREAM_DELIMITERS[plan.format]
+    yield opening
+    position = 0
+    async for doc in cursor:
+        yield stream_item(doc, plan.format, plan.fields, position)
+        position += 1
+    yield closing
+
+
+async def query_response(request, filters):
+    """Shared query runner: pagination (limit/cursor), projection (fields) and streaming (format)."""
+    try:
+        plan = FindPlan(filters, request.query_params)
+    except ValueError as e:
+        return error_response(str(e))
+
+    cursor = plan.find(get_async_db().hackathons)
+    if plan.format:
+        return StreamingResponse(stream_cursor(cursor, plan), media_type=STREAM_MIMETYPES[plan.format])
+    docs, next_cursor = plan.page(await cursor.to_list(None))
+    return json_response(docs, request, next_cursor)
+
+
+# ✅ Health Check Route
+async def health_check(request):
+    return JSONResponse({"status": "running"})
+
+
+# ✅ Prometheus metrics of this worker
+async def get_metrics(request):
+    return Response(metrics.render(), headers={"Content-Type": metrics.METRICS_CONTENT_TYPE})
+
+
+# ✅ Route: Get All Hackathons (optionally one `mode=`, `source=` or `upcoming=1` slice)
+async def get_hackathons(request):
+    name = snapshot_name(request.query_params)
+    if name:
+        await generation.poll()
+        cache.refresh_generation()
+        snapshot = ((await snapshots.get()) or {}).get(name)
+        if snapshot and snapshot.is_current():
+            status, body, headers = snapshot.reply(request.headers.get("accept-encoding"),
+                                                   request.headers.get("if-none-match"))
+            return Response(body, status_code=status, headers=headers, media_type="application/json")
+    return await cached(request, lambda request: query_response(request, facet_filters(request.query_params)))
+
+
+# ✅ Route: Search Hackathons (ranked, prefix/typo tolerant)
+async def search(request):
+    args = request.query_params
+    index = await search_index.get()
+    if "q" in args:
+        results = index.search(args["q"])
+    else:
+        results = index.search(args.get("name", ""), fields=["name"])
+    try:
+        page, next_cursor, fmt = page_list(results, args)
+    except ValueError as e:
+        return error_response(str(e))
+    if fmt:
+        return StreamingResponse(stream_docs(page, fmt, None), media_type=STREAM_MIMETYPES[fmt])
+    return json_response(page, request, next_cursor)
+
+
+async def search_hackathons(request):
+    return await cached(request, search)
+
+
+# ✅ Route: Filter Hackathons (Date, Mode, Location, Prize)
+async def filter_query(request):
+    try:
+        filters = filter_params(request.query_params)
+    except ValueError as e:
+        return error_response(str(e))
+    return await query_response(request, filters)
+
+
+async def filter_hackathons(request):
+    return await cached(request, filter_query)
+
+
+# ✅ Route: Nearby Hackathons (within `radius` km of `lat`/`lon`, nearest first)
+async def nearby_query(request):
+    try:
+        filters = nearby_params(request.query_params)
+        cursor = nearby_cursor(get_async_db().hackathons, filters, request.query_params)
+    except ValueError as e:
+        return error_response(str(e))
+    return json_response(await cursor.to_list(None), request)
+
+
+async def nearby_hackathons(request):
+    return await cached(request, nearby_query)
+
+
+# ✅ Route: Hackathon Stats (counts by mode, source, location, month and prize bucket)
+async def stats_query(request):
+    try:
+        filters = filter_params(request.query_params)
+    except ValueError as e:
+        return error_response(str(e))
+    cursor = await get_async_db().hackathons.aggregate(stats_pipeline(filters))
+    return Response(stats_json(await cursor.to_list(None)), media_type="application/json")
+
+
+async def hackathon_stats(request):
+    return await cached(request, stats_query)
+
+
+@contextlib.asynccontextmanager
+async def lifespan(app):
+    yield
+    await close_async_client()
+
+
+app = Starlette(
+    routes=[
+        Route("/health", health_check),
+        Route("/metrics", get_metrics),
+        Route("/hackathons", get_hackathons),
+        Route("/hackathons/search", search_hackathons),
+        Route("/hackathons/filter", filter_hackathons),
+        Route("/hackathons/nearby", nearby_hackathons),
+        Route("/hackathons/stats", hackathon_stats),
+    ],
+    lifespan=lifespan,
+)
+app.add_middleware(MetricsMiddleware)
+
+# ✅ Run with uvicorn on Render or Local
+if __name__ == "__main__":
+    import uvicorn
+
+    uvicorn.run("asgi_app:app", host="0.0.0.0", port=int(os.environ.get("PORT", 10000)),
+                workers=int(os.environ.get("WEB_CONCURRENCY", 1)))
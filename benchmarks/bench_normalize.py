@@ -0,0 +1,110 @@
+"""
+Micro-benchmark of the normalization engine (normalize.py).
+
+Reports the per-item cost of parsing dates and prizes cold (memo caches
+cleared), warm (every string already memoized), and through the batch API on
+a realistic list where most strings repeat.
+
+    python benchmarks/bench_normalize.py [--items 10000]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import date
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import normalize  # noqa: E402
+
+DEVPOST_DATES = [
+    "Jan 31 - Mar 02, 2025", "Feb 01 - 26, 2025", "Dec 18, 2024 - Mar 02, 2025",
+    "Mar 02, 2025", "Dec 18 - Jan 05, 2025", "Not available",
+]
+MLH_DATES = ["JAN 10TH - 12TH", "Feb 21st - 23rd", "Dec 30th - Jan 2nd", "Mar 3rd - 5th", "Sept 9th - 11th"]
+# (text, today, expected (start, end)): the season page lists upcoming events, so years are inferred forward
+MLH_YEAR_CASES = [
+    ("Jun 10th - 12th", date(2025, 11, 1), (date(2026, 6, 10), date(2026, 6, 12))),
+    ("Oct 25th - 27th", date(2025, 11, 1), (date(2025, 10, 25), date(2025, 10, 27))),
+    ("Dec 30th - Jan 2nd", date(2025, 11, 1), (date(2025, 12, 30), date(2026, 1, 2))),
+    ("Jan 10th - 12th", date(2025, 12, 20), (date(2026, 1, 10), date(2026, 1, 12))),
+    ("Feb 29th - Mar 1st", date(2025, 3, 1), (date(2028, 2, 29), date(2028, 3, 1))),
+]
+PRIZES = ["$10,000", "$5K", "Between $5K and $10K", "$1.5M in prizes", "Non-cash prizes", "₹ 50,000 USD"]
+
+
+def sample(values, items, distinct):
+    """`items` strings drawn from `distinct` variants of `values` (varying the day keeps strings unique)."""
+    variants = [f"{value}{' ' * (i // len(values))}" for i, value in enumerate(values * (distinct // len(values) + 1))]
+    variants = variants[:distinct]
+    return [random.choice(variants) for _ in range(items)]
+
+
+def clear_caches():
+    for parser in (normalize.parse_date_range, normalize._parse_mlh_date, normalize.parse_prize):
+        parser.cache_clear()
+
+
+def per_item_us(func, texts, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func(texts)
+        best = min(best, time.perf_counter() - started)
+    return best / len(texts) * 1e6
+
+
+def check_mlh_years():
+    """Verifies the MLH year inference against MLH_YEAR_CASES before timing anything."""
+    for text, today, expected in MLH_YEAR_CASES:
+        parsed = normalize.parse_mlh_date(text, today)
+        if parsed != expected:
+            raise SystemExit(f"❌ parse_mlh_date({text!r}, today={today}) returned {parsed}, expected {expected}")
+
+
+def run(items):
+    random.seed(42)
+    cases = {
+        "devpost dates": (normalize.parse_date_range, normalize.normalize_date_ranges, sample(DEVPOST_DATES, items, 60)),
+        "mlh dates": (normalize.parse_mlh_date, normalize.normalize_mlh_dates, sample(MLH_DATES, items, 50)),
+        "prizes": (normalize.parse_prize, normalize.normalize_prizes, sample(PRIZES, items, 60)),
+    }
+
+    results = {}
+    for name, (parser, batch, texts) in cases.items():
+        def cold(texts, parser=parser):
+            for text in texts:
+                clear_caches()
+                parser(text)
+
+        def warm(texts, parser=parser):
+            for text in texts:
+                parser(text)
+
+        def batched(texts, batch=batch):
+            clear_caches()
+            batch(texts)
+
+        cold_texts = texts[: max(1, items // 10)]  # cache clearing dominates, keep this run short
+        results[name] = {
+            "cold_us": per_item_us(cold, cold_texts),
+            "warm_us": per_item_us(warm, texts),
+            "batch_us": per_item_us(batched, texts),
+        }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--items", type=int, default=10000)
+    args = parser.parse_args()
+
+    check_mlh_years()
+    print(f"{'case':<15}{'cold µs/item':>14}{'warm µs/item':>14}{'batch µs/item':>15}")
+    for name, result in run(args.items).items():
+        print(f"{name:<15}{result['cold_us']:>14.2f}{result['warm_us']:>14.2f}{result['batch_us']:>15.2f}")
+
+
+if __name__ == "__main__":
+    main()
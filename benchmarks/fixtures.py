@@ -0,0 +1,214 @@
+"""
+Listing-page fixtures for the offline benchmarks.
+
+    python benchmarks/fixtures.py            # (re)generate the synthetic fixtures
+    python benchmarks/fixtures.py --record   # record the API payloads / MLH page from the live sites
+
+Synthetic fixtures follow the markup and payload shapes the scrapers parse,
+with 100 cards each and a fixed seed so runs are comparable. Recorded files
+replace the API payloads and the MLH season page; the browser listing pages
+(`*_listing.html`) are always synthetic.
+"""
+import argparse
+import html
+import json
+import os
+import random
+import sys
+from datetime import date, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+CARDS = 100
+
+FIXTURES = ("devpost_api.json", "devpost_listing.html", "mlh_season.html", "devfolio_api.json", "devfolio_listing.html")
+
+WORDS = ["AI", "Hack", "Climate", "Fintech", "Health", "Open", "Quantum", "Web3", "Data", "Space", "Code", "Build"]
+CITIES = ["London, UK", "Bengaluru, India", "New York, NY", "Toronto, ON", "Berlin, Germany"]
+PRIZES = ["$10,000", "$5,000", "$1,500", "$50,000", "$750", "₹ 2,00,000", ""]
+MONTHS = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+
+
+def path(name):
+    return os.path.join(FIXTURE_DIR, name)
+
+
+def load_json(name):
+    with open(path(name)) as fixture:
+        return json.load(fixture)
+
+
+def load_text(name):
+    with open(path(name), encoding="utf-8") as fixture:
+        return fixture.read()
+
+
+def patch_mongomock():
+    """
+    Lets mongomock run the scrapers' bulk writes. mongomock 4.3 predates the `sort`
+    argument pymongo >= 4.11 passes to the bulk builder for UpdateOne / ReplaceOne
+    (always None here), so its builder is taught to accept and ignore it.
+    """
+    from mongomock.collection import BulkOperationBuilder
+
+    if getattr(BulkOperationBuilder, "_accepts_sort", False):
+        return
+
+    def ignoring_sort(add):
+        def wrapper(self, *args, sort=None, **kwargs):
+            return add(self, *args, **kwargs)
+        return wrapper
+
+    for name in ("add_update", "add_replace"):
+        setattr(BulkOperationBuilder, name, ignoring_sort(getattr(BulkOperationBuilder, name)))
+    BulkOperationBuilder._accepts_sort = True
+
+
+def _events(count, seed):
+    rng = random.Random(seed)
+    start = date(2025, 1, 6)
+    for i in range(count):
+        begins = start + timedelta(days=rng.randint(0, 300))
+        yield {
+            "i": i,
+            "name": f"{rng.choice(WORDS)} {rng.choice(WORDS)} Hackathon {i}",
+            "start": begins,
+            "end": begins + timedelta(days=rng.randint(1, 45)),
+            "online": rng.random() < 0.5,
+            "city": rng.choice(CITIES),
+            "prize": rng.choice(PRIZES),
+        }
+
+
+def _devpost_period(event):
+    start, end = event["start"], event["end"]
+    if start.year != end.year:
+        return f"{MONTHS[start.month - 1]} {start.day:02d}, {start.year} - {MONTHS[end.month - 1]} {end.day:02d}, {end.year}"
+    if start.month == end.month:
+        return f"{MONTHS[start.month - 1]} {start.day:02d} - {end.day:02d}, {end.year}"
+    return f"{MONTHS[start.month - 1]} {start.day:02d} - {MONTHS[end.month - 1]} {end.day:02d}, {end.year}"
+
+
+def _ordinal(day):
+    suffix = "th" if 11 <= day <= 13 else {1: "st", 2: "nd", 3: "rd"}.get(day % 10, "th")
+    return f"{day}{suffix}"
+
+
+def devpost_api(count=CARDS):
+    return {"hackathons": [{
+        "title": event["name"],
+        "url": f"https://hackathon-{event['i']}.devpost.com/",
+        "submission_period_dates": _devpost_period(event),
+        "displayed_location": {"location": "Online" if event["online"] else event["city"]},
+        "prize_amount": f"$<span data-currency-value>{event['prize'].lstrip('$')}</span>" if event["prize"] else "",
+    } for event in _events(count, seed=1)]}
+
+
+def devpost_listing(count=CARDS):
+    tiles = "".join(
+        f'<div class="hackathon-tile"><a href="https://hackathon-{event["i"]}.devpost.com/">'
+        f'<h3 class="mb-4">{html.escape(event["name"])}</h3>'
+        f'<div class="submission-period">{_devpost_period(event)}</div>'
+        f'<div class="info">{"Online" if event["online"] else event["city"]}</div>'
+        + (f'<div class="prize"><span class="prize-amount">{event["prize"]}</span></div>' if event["prize"] else "")
+        + "</a></div>"
+        for event in _events(count, seed=1)
+    )
+    return f"<!doctype html><html><body><div class=\"results\">{tiles}</div></body></html>"
+
+
+def mlh_season(count=CARDS):
+    cards = "".join(
+        f'<div class="event-wrapper"><a href="https://event-{event["i"]}.mlh.io/">'
+        f'<h3 class="event-name">{html.escape(event["name"])}</h3>'
+        f'<p class="event-date">{MONTHS[event["start"].month - 1]} {_ordinal(event["start"].day)} - '
+        f'{_ordinal(min(event["start"].day + 2, 28))}</p>'
+        f'<div class="event-location"><span>{event["city"].split(", ")[0]}</span>, '
+        f'<span>{event["city"].split(", ")[1]}</span></div>'
+        f'<div class="event-hybrid-notes"><span>{"Digital Only" if event["online"] else "In-Person Only"}</span></div>'
+        "</a></div>"
+        for event in _events(count, seed=2)
+    )
+    past = '<div class="event-wrapper"><a href="https://past.mlh.io/"><h3 class="event-name">Past Hack</h3></a></div>'
+    return ("<!doctype html><html><body>"
+            f'<div class="container feature"><div class="row">{cards}</div></div>'
+            f'<div class="container feature"><div class="row">{past}</div></div>'
+            "</body></html>")
+
+
+def devfolio_api(count=CARDS):
+    return {"hits": {"hits": [{"_source": {
+        "name": event["name"],
+        "slug": f"hackathon-{event['i']}",
+        "starts_at": f"{event['start'].isoformat()}T10:00:00+05:30",
+        "ends_at": f"{event['end'].isoformat()}T18:00:00+05:30",
+        "is_online": event["online"],
+        "city": None if event["online"] else event["city"].split(", ")[0],
+    }} for event in _events(count, seed=3)]}}
+
+
+def devfolio_listing(count=CARDS):
+    # Matches DEVFOLIO_CARDS_XPATH and the card-relative DEVFOLIO_FIELD_XPATHS
+    cards = "".join(
+        "<div><div><div>"
+        f'<div><div><div><a href="https://hackathon-{event["i"]}.devfolio.co/"><h3>{html.escape(event["name"])}</h3></a>'
+        "</div></div></div>"
+        "<div></div>"
+        f'<div><div><div><p>{"Online" if event["online"] else "Offline"}</p></div><div></div>'
+        f'<div><p>STARTS {event["start"].strftime("%d/%m/%y")}</p></div></div></div>'
+        "</div></div></div>"
+        for event in _events(count, seed=3)
+    )
+    return ('<!doctype html><html><body><div id="__next"><div></div>'
+            f"<div><div></div><div><div><div>{cards}</div></div></div></div>"
+            "</div></body></html>")
+
+
+def write(name, content):
+    os.makedirs(FIXTURE_DIR, exist_ok=True)
+    with open(path(name), "w", encoding="utf-8") as fixture:
+        if isinstance(content, str):
+            fixture.write(content)
+        else:
+            json.dump(content, fixture, indent=1, ensure_ascii=False)
+    print(f"✅ Wrote {path(name)}")
+
+
+def generate():
+    write("devpost_api.json", devpost_api())
+    write("devpost_listing.html", devpost_listing())
+    write("mlh_season.html", mlh_season())
+    write("devfolio_api.json", devfolio_api())
+    write("devfolio_listing.html", devfolio_listing())
+
+
+def record():
+    """Records live payloads with the scrapers' own HTTP client (about 100 cards each)."""
+    from devfolio_scraper import DEVFOLIO_API_URL
+    from devpost_scraper import DEVPOST_API_URL
+    from http_utils import fetch_html, fetch_json, get_session
+    from mlh_scraper import MLH_URL
+
+    session = get_session()
+    hackathons, page = [], 1
+    while len(hackathons) < CARDS:
+        batch = fetch_json(session, DEVPOST_API_URL, params={"page": page, "status[]": ["upcoming", "open"]})
+        if not batch.get("hackathons"):
+            break
+        hackathons.extend(batch["hackathons"])
+        page += 1
+    write("devpost_api.json", {"hackathons": hackathons[:CARDS]})
+    write("mlh_season.html", fetch_html(session, MLH_URL))
+    write("devfolio_api.json", fetch_json(session, DEVFOLIO_API_URL, method="POST",
+                                          json={"type": "application_open", "from": 0, "size": CARDS}))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--record", action="store_true", help="record payloads from the live sites")
+    args = parser.parse_args()
+    generate()
+    if args.record:
+        record()
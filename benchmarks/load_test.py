@@ -0,0 +1,184 @@
+"""
+Load test of the sync (Flask under gunicorn) and async (ASGI under uvicorn)
+serving modes against the same MongoDB.
+
+Seeds a throwaway database with synthetic hackathons, starts each server with
+the same number of worker processes, drives it with concurrent keep-alive
+clients for a fixed time per endpoint, and reports requests per second and
+requests per server CPU-second (Linux only), so the two modes can be compared
+per core. The response cache is disabled unless --cache is given, so every
+request reaches MongoDB.
+
+    MONGO_URI=mongodb://localhost:27017 python benchmarks/load_test.py [--docs 5000] [--concurrency 64]
+
+Needs a mongod: the async driver cannot talk to mongomock:// directly. Without
+one, run benchmarks/wire_mongod.py and point MONGO_URI at it.
+"""
+import argparse
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+from datetime import datetime, timedelta
+
+import requests
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from mongo_utils import get_client  # noqa: E402
+
+DB_NAME = "hackathon_loadtest"
+
+ENDPOINTS = [
+    "/hackathons?limit=100",
+    "/hackathons/filter?mode=Online&prize_money=>=1000&limit=100",
+    "/hackathons/search?q=ai%20hack&limit=20",
+]
+
+MODES = {
+    "sync": lambda port, workers: ["gunicorn", "--bind", f"127.0.0.1:{port}", "--workers", str(workers),
+                                   "FlaskApi:app"],
+    "async": lambda port, workers: ["uvicorn", "asgi_app:app", "--host", "127.0.0.1", "--port", str(port),
+                                    "--workers", str(workers), "--no-access-log"],
+}
+
+WORDS = ["AI", "Hack", "Climate", "Fintech", "Health", "Open", "Quantum", "Web3", "Data", "Space", "Code", "Build"]
+
+
+def seed(docs):
+    """Recreates the load-test database with `docs` synthetic hackathons."""
+    get_client().drop_database(DB_NAME)
+    db = get_client()[DB_NAME]
+    random.seed(7)
+    start = datetime(2025, 1, 1)
+    rows = []
+    for i in range(docs):
+        begins = start + timedelta(days=random.randint(0, 365))
+        rows.append({
+            "name": f"{random.choice(WORDS)} {random.choice(WORDS)} Hackathon {i}",
+            "start_date": begins,
+            "end_date": begins + timedelta(days=random.randint(1, 30)),
+            "mode": random.choice(["Online", "Offline"]),
+            "location": random.choice(["Everywhere", "London, UK", "Bengaluru, India", "New York, USA"]),
+            "prize_money": random.choice([0, 500, 1000, 5000, 10000, 50000]),
+            "apply_link": f"https://example.com/hackathons/{i}",
+            "source": random.choice(["Devpost", "MLH", "Devfolio"]),
+        })
+    db.hackathons.insert_many(rows)
+    db.hackathons.create_index([("start_date", 1), ("_id", 1)])
+    db.hackathons.create_index([("mode", 1), ("start_date", 1)])
+    db.hackathons.create_index([("prize_money", 1), ("start_date", 1)])
+
+
+def cpu_seconds(pid):
+    """User + system CPU time of a process and its children (the server's workers), or None off Linux."""
+    try:
+        with open(f"/proc/{pid}/stat") as stat:
+            fields = stat.read().rsplit(")", 1)[1].split()
+    except OSError:
+        return None
+    ticks = sum(int(value) for value in fields[11:15])  # utime, stime, cutime, cstime
+    children = subprocess.run(["pgrep", "-P", str(pid)], capture_output=True, text=True).stdout.split()
+    for child in children:
+        child_ticks = cpu_seconds(int(child))
+        if child_ticks is not None:
+            ticks += child_ticks * os.sysconf("SC_CLK_TCK")
+    return ticks / os.sysconf("SC_CLK_TCK")
+
+
+def wait_until_up(base_url, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if requests.get(f"{base_url}/health", timeout=1).ok:
+                return
+        except requests.RequestException:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"server at {base_url} did not come up")
+
+
+def hammer(url, concurrency, duration):
+    """Requests `url` from `concurrency` keep-alive clients for `duration` seconds; returns (ok, errors)."""
+    counts = {"ok": 0, "errors": 0}
+    lock = threading.Lock()
+    deadline = time.monotonic() + duration
+
+    def client():
+        session = requests.Session()
+        ok = errors = 0
+        while time.monotonic() < deadline:
+            try:
+                response = session.get(url, timeout=30)
+                ok += response.status_code == 200
+                errors += response.status_code != 200
+            except requests.RequestException:
+                errors += 1
+        with lock:
+            counts["ok"] += ok
+            counts["errors"] += errors
+
+    threads = [threading.Thread(target=client) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return counts["ok"], counts["errors"]
+
+
+def run_mode(mode, args):
+    port = args.port
+    env = dict(os.environ, MONGO_DB=DB_NAME, PYTHONUNBUFFERED="1")
+    if not args.cache:
+        env["CACHE_MAX_ENTRIES"] = "0"
+    server = subprocess.Popen(MODES[mode](port, args.workers), cwd=ROOT, env=env,
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    base_url = f"http://127.0.0.1:{port}"
+    results = []
+    try:
+        wait_until_up(base_url)
+        for endpoint in ENDPOINTS:
+            hammer(base_url + endpoint, args.concurrency, 1)  # warm-up: pools, search index
+            cpu_before = cpu_seconds(server.pid)
+            ok, errors = hammer(base_url + endpoint, args.concurrency, args.duration)
+            cpu_after = cpu_seconds(server.pid)
+            cpu = cpu_after - cpu_before if cpu_before is not None and cpu_after is not None else None
+            results.append((endpoint, ok / args.duration, ok / cpu if cpu else None, errors))
+    finally:
+        server.terminate()
+        server.wait(timeout=10)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--docs", type=int, default=5000, help="synthetic hackathons to seed")
+    parser.add_argument("--concurrency", type=int, default=64, help="concurrent clients")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per endpoint")
+    parser.add_argument("--workers", type=int, default=1, help="server worker processes (same for both modes)")
+    parser.add_argument("--port", type=int, default=18000)
+    parser.add_argument("--modes", nargs="+", choices=sorted(MODES), default=["sync", "async"])
+    parser.add_argument("--cache", action="store_true", help="keep the in-process response cache enabled")
+    args = parser.parse_args()
+
+    if os.getenv("MONGO_URI", "").startswith("mongomock://"):
+        raise SystemExit("The load test needs a mongod (MONGO_URI=mongodb://...); see benchmarks/wire_mongod.py.")
+
+    print(f"Seeding {args.docs} hackathons into {DB_NAME}...")
+    seed(args.docs)
+
+    print(f"\n{'mode':<6} {'endpoint':<62} {'req/s':>9} {'req/cpu-s':>10} {'errors':>7}")
+    try:
+        for mode in args.modes:
+            for endpoint, rps, per_cpu, errors in run_mode(mode, args):
+                per_cpu_text = f"{per_cpu:10.0f}" if per_cpu else f"{'n/a':>10}"
+                print(f"{mode:<6} {endpoint:<62} {rps:9.0f} {per_cpu_text} {errors:7d}")
+    finally:
+        get_client().drop_database(DB_NAME)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,399 @@
+"""
+Offline benchmark suite: scraping parsers, extraction, bulk writes and API latency.
+
+Runs against the fixtures in benchmarks/fixtures and an in-memory MongoDB
+stand-in (mongomock, see requirements-dev.txt) unless --mongo-uri points at a
+real mongod, so no site or Atlas is touched.
+
+    python benchmarks/run_benchmarks.py                          # everything, 1k/10k/100k API sizes
+    python benchmarks/run_benchmarks.py --only parse extraction  # a subset
+    python benchmarks/run_benchmarks.py --save-baseline benchmarks/baseline.json
+    python benchmarks/run_benchmarks.py --compare benchmarks/baseline.json [--fail-on-regression]
+
+Sections:
+- parse: µs per call of extract_dates, extract_prize_money and parse_mlh_date (cold and memoized)
+- extraction: ms per 100 cards for each scraper's HTTP parser (and, with --browser, the
+  Selenium batch/per-element extractors on the listing fixtures)
+- pipeline: ms per 100 hackathons in each stage of the shared scraping pipeline, per source,
+  replaying the API/HTML fixtures (stages run inline so they do not overlap)
+- bulk_write: save_hackathons throughput for a first load, an unchanged re-run and a 10% update
+- api: requests/s and p50/p95/p99 latency per endpoint at each --sizes document count
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import fixtures  # noqa: E402
+
+SECTIONS = ("parse", "extraction", "pipeline", "bulk_write", "api")
+
+API_ENDPOINTS = {
+    "list_page": ("/hackathons?limit=100", {}),
+    "list_snapshot": ("/hackathons", {"Accept-Encoding": "gzip"}),
+    "filter": ("/hackathons/filter?mode=Online&prize_money=>=1000&limit=100", {}),
+    "search": ("/hackathons/search?q=ai%20hack&limit=20", {}),
+    "stats": ("/hackathons/stats?mode=Online", {}),
+}
+
+# Metrics where bigger is better; everything else is a time
+HIGHER_IS_BETTER = ("_per_s", "_rps")
+
+
+def best_of(func, repeat=5):
+    """Best wall-clock time of `repeat` calls of `func`, in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+class PrizeTile:
+    """Minimal stand-in for the Devpost tile WebElement read by extract_prize_money."""
+
+    class _Text:
+        def __init__(self, text):
+            self.text = text
+
+    def __init__(self, prize):
+        self.prize = prize
+
+    def find_element(self, by, value):
+        if not self.prize:
+            raise LookupError(value)
+        return self._Text(self.prize)
+
+
+def bench_parse(args):
+    import normalize
+    from devpost_scraper import extract_dates, extract_prize_money
+    from mlh_scraper import parse_mlh_date
+    from http_utils import strip_tags
+
+    items = fixtures.load_json("devpost_api.json")["hackathons"]
+    periods = [item["submission_period_dates"] for item in items]
+    tiles = [PrizeTile(strip_tags(item["prize_amount"])) for item in items]
+    mlh_dates = [card["event-date"] for card in mlh_cards()]
+
+    cases = {
+        "extract_dates": (lambda: [extract_dates(text) for text in periods], len(periods)),
+        "extract_prize_money": (lambda: [extract_prize_money(tile) for tile in tiles], len(tiles)),
+        "parse_mlh_date": (lambda: [parse_mlh_date(text) for text in mlh_dates], len(mlh_dates)),
+    }
+
+    def clear_caches():
+        for parser in (normalize.parse_date_range, normalize._parse_mlh_date, normalize.parse_prize):
+            parser.cache_clear()
+
+    results = {}
+    for name, (run, count) in cases.items():
+        def cold(run=run):
+            clear_caches()
+            run()
+
+        results[f"parse.{name}.cold_us"] = best_of(cold) / count * 1e6
+        results[f"parse.{name}.warm_us"] = best_of(run) / count * 1e6
+    return results
+
+
+def mlh_cards():
+    from mlh_scraper import MLHEventParser
+    parser = MLHEventParser()
+    parser.feed(fixtures.load_text("mlh_season.html"))
+    parser.close()
+    return next(section for section in parser.sections if section)
+
+
+def bench_extraction(args):
+    import normalize
+    from devfolio_scraper import parse_devfolio_api
+    from devpost_scraper import parse_devpost_api
+    from mlh_scraper import parse_mlh_html
+
+    devpost = fixtures.load_json("devpost_api.json")
+    devfolio = fixtures.load_json("devfolio_api.json")
+    mlh = fixtures.load_text("mlh_season.html")
+    cases = {
+        "devpost_api": (lambda: parse_devpost_api(devpost), len(devpost["hackathons"])),
+        "mlh_html": (lambda: parse_mlh_html(mlh), len(mlh_cards())),
+        "devfolio_api": (lambda: parse_devfolio_api(devfolio), len(devfolio["hits"]["hits"])),
+    }
+
+    results = {}
+    for name, (run, count) in cases.items():
+        def cold(run=run):
+            for parser in (normalize.parse_date_range, normalize._parse_mlh_date, normalize.parse_prize):
+                parser.cache_clear()
+            run()
+
+        results[f"extraction.{name}.ms_per_100"] = best_of(cold) / count * 100 * 1e3
+    if args.browser:
+        results.update(bench_browser_extraction())
+    return results
+
+
+def bench_browser_extraction():
+    """Selenium extraction of the listing fixtures (file:// URLs) in batch ("js") and per-element ("dom") mode."""
+    from devfolio_scraper import DEVFOLIO_CARDS_XPATH, DEVFOLIO_EXTRACT_JS, DEVFOLIO_FIELD_XPATHS, extract_cards_dom
+    from devpost_scraper import DEVPOST_EXTRACT_JS, extract_tiles_dom
+    from mlh_scraper import MLH_EXTRACT_JS, extract_events_dom
+    from scraper_utils import extract_cards, get_driver
+
+    pages = {
+        "devpost": ("devpost_listing.html", DEVPOST_EXTRACT_JS, extract_tiles_dom, (fixtures.CARDS,)),
+        "mlh": ("mlh_season.html", MLH_EXTRACT_JS, extract_events_dom, ()),
+        "devfolio": ("devfolio_listing.html", DEVFOLIO_EXTRACT_JS, extract_cards_dom,
+                     (DEVFOLIO_CARDS_XPATH, DEVFOLIO_FIELD_XPATHS)),
+    }
+    driver = get_driver()
+    if driver is None:
+        raise RuntimeError("WebDriver initialization failed")
+
+    results = {}
+    previous_mode = os.environ.get("SCRAPER_EXTRACTION")
+    try:
+        for name, (fixture, script, dom_extractor, extra) in pages.items():
+            driver.get("file://" + fixtures.path(fixture))
+            for mode in ("js", "dom"):
+                os.environ["SCRAPER_EXTRACTION"] = mode
+                cards = []
+                seconds = best_of(lambda: cards.append(extract_cards(driver, script, dom_extractor, *extra)), repeat=3)
+                results[f"extraction.browser_{name}_{mode}.ms_per_100"] = seconds / max(len(cards[-1]), 1) * 100 * 1e3
+    finally:
+        driver.quit()
+        if previous_mode is None:
+            os.environ.pop("SCRAPER_EXTRACTION", None)
+        else:
+            os.environ["SCRAPER_EXTRACTION"] = previous_mode
+    return results
+
+
+def replay(page):
+    """A Source.pages replacement yielding one recorded page."""
+    def pages(session, state):
+        yield page
+    return pages
+
+
+def bench_pipeline(args):
+    from pipeline import Collector, Pipeline, load_sources
+    from scrape_report import SourceProfile
+
+    replays = {
+        "Devpost": lambda: fixtures.load_json("devpost_api.json"),
+        "MLH": lambda: fixtures.load_text("mlh_season.html"),
+        "Devfolio": lambda: fixtures.load_json("devfolio_api.json"),
+    }
+    results = {}
+    for name, source in load_sources().items():
+        source.pages = replay(replays[name]())
+        best = {}
+        for _ in range(5):
+            profile = SourceProfile(name)
+            count = len(Pipeline(source, None, Collector(), profile=profile).run(threaded=False))
+            for stage, entry in profile.stages.items():
+                best[stage] = min(best.get(stage, float("inf")), entry["seconds"])
+        for stage in Pipeline.STEPS:
+            results[f"pipeline.{name.lower()}.{stage}_ms_per_100"] = best[stage] / count * 100 * 1e3
+    return results
+
+
+def synthetic_hackathons(count, seed=11):
+    """`count` distinct Devpost-shaped documents built from the fixture payload."""
+    from devpost_scraper import parse_devpost_api
+
+    template = parse_devpost_api(fixtures.load_json("devpost_api.json"))
+    rng = random.Random(seed)
+    docs = []
+    for i in range(count):
+        doc = dict(template[i % len(template)])
+        doc["name"] = f"{doc['name']} #{i}"
+        doc["apply_link"] = f"https://bench-{i}.devpost.com/"
+        if isinstance(doc.get("start_date"), datetime):
+            shift = timedelta(days=rng.randint(-30, 30))
+            doc["start_date"] += shift
+            if isinstance(doc.get("end_date"), datetime):
+                doc["end_date"] += shift
+        doc["mode"] = rng.choice(["Online", "Offline"])
+        doc["source"] = rng.choice(["Devpost", "MLH", "Devfolio"])
+        docs.append(doc)
+    return docs
+
+
+def bench_bulk_write(args):
+    from mongo_utils import get_client
+    from scraper_utils import ensure_indexes, save_hackathons
+
+    db = get_client()["bench_bulk_write"]
+    db.hackathons.drop()
+    ensure_indexes(db)
+    docs = [dict(doc, source="Devpost") for doc in synthetic_hackathons(args.write_docs)]
+
+    results = {}
+    started = time.perf_counter()
+    save_hackathons(db.hackathons, docs, "Devpost")
+    results["bulk_write.first_load_docs_per_s"] = len(docs) / (time.perf_counter() - started)
+
+    started = time.perf_counter()
+    save_hackathons(db.hackathons, docs, "Devpost")
+    results["bulk_write.unchanged_docs_per_s"] = len(docs) / (time.perf_counter() - started)
+
+    for doc in docs[::10]:
+        doc["prize_money"] = (doc.get("prize_money") or 0) + 1
+    started = time.perf_counter()
+    save_hackathons(db.hackathons, docs, "Devpost")
+    results["bulk_write.update_10pct_docs_per_s"] = len(docs) / (time.perf_counter() - started)
+
+    get_client().drop_database("bench_bulk_write")
+    return results
+
+
+def seed_api_database(size):
+    """Loads `size` hackathons plus their snapshots into the database named after `size`."""
+    from mongo_utils import bump_generation, get_client
+    from scraper_utils import ensure_indexes, hackathon_key
+    from snapshots import publish_snapshots
+
+    name = f"bench_api_{size}"
+    get_client().drop_database(name)
+    db = get_client()[name]
+    docs = synthetic_hackathons(size)
+    for doc in docs:
+        doc["key"] = hackathon_key(doc)
+    for offset in range(0, len(docs), 10000):
+        db.hackathons.insert_many(docs[offset:offset + 10000])
+    # indexes after the bulk load (mongomock checks unique indexes by scanning on every insert)
+    ensure_indexes(db)
+    publish_snapshots(db)
+    bump_generation(db)
+    return name
+
+
+def bench_api(args):
+    os.environ["CACHE_MAX_ENTRIES"] = "0"  # measure the query path, not the response cache
+    import FlaskApi
+
+    client = FlaskApi.app.test_client()
+    results = {}
+    for size in args.sizes:
+        os.environ["MONGO_DB"] = seed_api_database(size)
+        FlaskApi.cache.clear()
+        FlaskApi.search_index.invalidate()
+        FlaskApi.snapshots.invalidate()
+
+        requests = max(5, min(args.requests, args.requests * 10000 // size))
+        for name, (url, headers) in API_ENDPOINTS.items():
+            client.get(url, headers=headers)  # warm-up: search index, snapshots, generation check
+            latencies = []
+            for _ in range(requests):
+                started = time.perf_counter()
+                response = client.get(url, headers=headers)
+                latencies.append(time.perf_counter() - started)
+                if response.status_code != 200:
+                    raise RuntimeError(f"{url} answered {response.status_code}: {response.get_data(as_text=True)[:200]}")
+            quantiles = statistics.quantiles(latencies, n=100)
+            prefix = f"api.{size}.{name}"
+            results[f"{prefix}.p50_ms"] = quantiles[49] * 1e3
+            results[f"{prefix}.p95_ms"] = quantiles[94] * 1e3
+            results[f"{prefix}.p99_ms"] = quantiles[98] * 1e3
+            results[f"{prefix}_rps"] = len(latencies) / sum(latencies)
+        from mongo_utils import get_client
+        get_client().drop_database(os.environ["MONGO_DB"])
+    return results
+
+
+BENCHMARKS = {
+    "parse": bench_parse,
+    "extraction": bench_extraction,
+    "pipeline": bench_pipeline,
+    "bulk_write": bench_bulk_write,
+    "api": bench_api,
+}
+
+
+def higher_is_better(metric):
+    return metric.endswith(HIGHER_IS_BETTER)
+
+
+def compare(results, baseline, threshold):
+    """Prints the change of every metric against `baseline`; returns the regressed metrics."""
+    regressions = []
+    print(f"\n{'metric':<52}{'baseline':>12}{'current':>12}{'change':>10}")
+    for metric, value in sorted(results.items()):
+        before = baseline.get(metric)
+        if not before:
+            print(f"{metric:<52}{'-':>12}{value:>12.2f}{'new':>10}")
+            continue
+        change = (value - before) / before
+        worse = -change if higher_is_better(metric) else change
+        flag = " ⚠️" if worse > threshold else ""
+        if flag:
+            regressions.append(metric)
+        print(f"{metric:<52}{before:>12.2f}{value:>12.2f}{change:>+10.1%}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--only", nargs="+", choices=SECTIONS, default=list(SECTIONS))
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000],
+                        help="document counts for the API benchmark")
+    parser.add_argument("--requests", type=int, default=200,
+                        help="requests per endpoint at 10k documents (scaled for other sizes)")
+    parser.add_argument("--write-docs", type=int, default=5000, help="documents for the bulk-write benchmark")
+    parser.add_argument("--browser", action="store_true", help="also time Selenium extraction (needs Chrome)")
+    parser.add_argument("--mongo-uri", default=os.getenv("BENCH_MONGO_URI", "mongomock://"),
+                        help="MongoDB to benchmark against (default: in-memory mongomock)")
+    parser.add_argument("--save-baseline", metavar="PATH", help="store the results as a baseline")
+    parser.add_argument("--compare", metavar="PATH", help="compare the results with a stored baseline")
+    parser.add_argument("--threshold", type=float, default=0.15, help="relative slowdown reported as a regression")
+    parser.add_argument("--fail-on-regression", action="store_true")
+    args = parser.parse_args()
+
+    os.environ["MONGO_URI"] = args.mongo_uri
+    if args.mongo_uri.startswith("mongomock://"):
+        fixtures.patch_mongomock()
+
+    results = {}
+    for section in args.only:
+        started = time.perf_counter()
+        section_results = BENCHMARKS[section](args)
+        print(f"\n== {section} ({time.perf_counter() - started:.1f}s)")
+        for metric, value in section_results.items():
+            print(f"{metric:<52}{value:>12.2f}")
+        results.update(section_results)
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as out:
+            json.dump({
+                "recorded_at": datetime.now(timezone.utc).isoformat(),
+                "python": platform.python_version(),
+                "machine": platform.platform(),
+                "mongo": "mongomock" if args.mongo_uri.startswith("mongomock://") else "mongod",
+                "results": results,
+            }, out, indent=2, sort_keys=True)
+        print(f"\n📝 Baseline written to {args.save_baseline}")
+
+    if args.compare:
+        with open(args.compare) as baseline_file:
+            baseline = json.load(baseline_file)
+        regressions = compare(results, baseline["results"], args.threshold)
+        if regressions:
+            print(f"\n⚠️ {len(regressions)} metrics regressed by more than {args.threshold:.0%}.")
+            if args.fail_on_regression:
+                raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,226 @@
+"""
+A MongoDB wire-protocol front end for mongomock, so the load test can compare
+the sync and async servers on a machine without a mongod.
+
+    python benchmarks/wire_mongod.py [--port 27099] [--latency-ms 2]
+    MONGO_URI=mongodb://127.0.0.1:27099 python benchmarks/load_test.py
+
+Speaks just enough of the protocol for pymongo's sync and async clients: the
+legacy OP_QUERY handshake and OP_MSG commands for find, aggregate, count,
+insert, update, delete and the admin chatter around them. Every cursor is
+returned in its first batch. Index builds are acknowledged and ignored.
+
+mongomock is not thread-safe, so commands run one at a time under a lock;
+`--latency-ms` is slept outside the lock on every reply to model the network
+and server time of a real deployment, which is what lets the async server
+overlap requests. Numbers measured against it are a model, not a substitute
+for a run against a real mongod.
+"""
+import argparse
+import os
+import socketserver
+import struct
+import sys
+import threading
+import time
+from datetime import datetime
+
+import bson
+import mongomock
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import fixtures  # noqa: E402
+
+OP_REPLY = 1
+OP_QUERY = 2004
+OP_MSG = 2013
+HEADER = struct.Struct("<iiii")
+
+HELLO = {
+    "ismaster": True, "isWritablePrimary": True, "helloOk": True, "maxBsonObjectSize": 16 * 1024 * 1024,
+    "maxMessageSizeBytes": 48 * 1000 * 1000, "maxWriteBatchSize": 100000, "logicalSessionTimeoutMinutes": 30,
+    "minWireVersion": 0, "maxWireVersion": 17, "readOnly": False, "ok": 1.0,
+}
+
+
+class MockServer:
+    """Runs commands against one in-memory mongomock client."""
+
+    def __init__(self, latency):
+        self.client = mongomock.MongoClient()
+        self.latency = latency
+        self._lock = threading.Lock()
+
+    def run(self, db_name, command):
+        name = next(iter(command))
+        handler = getattr(self, "cmd_" + name.lower(), None)
+        try:
+            if handler is None:
+                raise NotImplementedError(f"command {name!r} is not supported")
+            with self._lock:
+                reply = handler(self.client[db_name], command)
+        except Exception as e:
+            reply = {"ok": 0.0, "errmsg": f"{type(e).__name__}: {e}", "code": 2}
+        if self.latency:
+            time.sleep(self.latency)
+        return reply
+
+    def cmd_hello(self, db, command):
+        return dict(HELLO, localTime=datetime.now())
+
+    cmd_ismaster = cmd_hello
+
+    def cmd_ping(self, db, command):
+        return {"ok": 1.0}
+
+    cmd_endsessions = cmd_killcursors = cmd_ping
+
+    def cmd_buildinfo(self, db, command):
+        return {"version": "6.0.0", "versionArray": [6, 0, 0, 0], "ok": 1.0}
+
+    def cmd_createindexes(self, db, command):
+        return {"ok": 1.0}
+
+    def cmd_find(self, db, command):
+        cursor = db[command["find"]].find(command.get("filter", {}), command.get("projection"))
+        if command.get("sort"):
+            cursor = cursor.sort(list(command["sort"].items()))
+        if command.get("skip"):
+            cursor = cursor.skip(command["skip"])
+        if command.get("limit"):
+            cursor = cursor.limit(abs(command["limit"]))
+        return self._cursor(db, command["find"], list(cursor))
+
+    def cmd_aggregate(self, db, command):
+        return self._cursor(db, command["aggregate"], list(db[command["aggregate"]].aggregate(command["pipeline"])))
+
+    def cmd_count(self, db, command):
+        return {"n": db[command["count"]].count_documents(command.get("query", {})), "ok": 1.0}
+
+    def cmd_insert(self, db, command):
+        documents = command["documents"]
+        db[command["insert"]].insert_many(documents)
+        return {"n": len(documents), "ok": 1.0}
+
+    def cmd_update(self, db, command):
+        collection = db[command["update"]]
+        matched = modified = 0
+        upserted = []
+        for index, update in enumerate(command["updates"]):
+            if update.get("multi"):
+                result = collection.update_many(update["q"], update["u"], upsert=update.get("upsert", False))
+            elif any(key.startswith("$") for key in update["u"]):
+                result = collection.update_one(update["q"], update["u"], upsert=update.get("upsert", False))
+            else:
+                result = collection.replace_one(update["q"], update["u"], upsert=update.get("upsert", False))
+            matched += result.matched_count
+            modified += result.modified_count
+            if result.upserted_id is not None:
+                upserted.append({"index": index, "_id": result.upserted_id})
+        reply = {"n": matched + len(upserted), "nModified": modified, "ok": 1.0}
+        if upserted:
+            reply["upserted"] = upserted
+        return reply
+
+    def cmd_delete(self, db, command):
+        collection = db[command["delete"]]
+        deleted = 0
+        for delete in command["deletes"]:
+            if delete.get("limit") == 1:
+                deleted += collection.delete_one(delete["q"]).deleted_count
+            else:
+                deleted += collection.delete_many(delete["q"]).deleted_count
+        return {"n": deleted, "ok": 1.0}
+
+    def cmd_drop(self, db, command):
+        db.drop_collection(command["drop"])
+        return {"ok": 1.0}
+
+    def cmd_dropdatabase(self, db, command):
+        self.client.drop_database(db.name)
+        return {"ok": 1.0}
+
+    @staticmethod
+    def _cursor(db, collection, documents):
+        return {"cursor": {"id": bson.Int64(0), "ns": f"{db.name}.{collection}", "firstBatch": documents}, "ok": 1.0}
+
+
+def read_cstring(data, offset):
+    end = data.index(b"\x00", offset)
+    return data[offset:end].decode(), end + 1
+
+
+def parse_msg(body):
+    """The command document of an OP_MSG body, with any document sequences folded in."""
+    flags, = struct.unpack_from("<I", body)
+    end = len(body) - (4 if flags & 1 else 0)
+    offset = 4
+    command = {}
+    while offset < end:
+        kind = body[offset]
+        offset += 1
+        size, = struct.unpack_from("<i", body, offset)
+        if kind == 0:
+            command = bson.decode(body[offset:offset + size])
+        else:
+            identifier, start = read_cstring(body, offset + 4)
+            command.setdefault(identifier, []).extend(bson.decode_all(body[start:offset + size]))
+        offset += size
+    return command
+
+
+class Handler(socketserver.BaseRequestHandler):
+    def recv_exactly(self, size):
+        data = b""
+        while len(data) < size:
+            chunk = self.request.recv(size - len(data))
+            if not chunk:
+                raise ConnectionError
+            data += chunk
+        return data
+
+    def handle(self):
+        server = self.server.mock
+        try:
+            while True:
+                length, request_id, _, opcode = HEADER.unpack(self.recv_exactly(HEADER.size))
+                body = self.recv_exactly(length - HEADER.size)
+                if opcode == OP_MSG:
+                    command = parse_msg(body)
+                    reply = bson.encode(server.run(command.pop("$db", "admin"), command))
+                    payload = struct.pack("<IB", 0, 0) + reply
+                elif opcode == OP_QUERY:
+                    collection, offset = read_cstring(body, 4)
+                    command = bson.decode_all(body[offset + 8:])[0]
+                    reply = bson.encode(server.run(collection.split(".", 1)[0], command.get("$query", command)))
+                    payload = struct.pack("<iqii", 0, 0, 0, 1) + reply
+                else:
+                    return
+                reply_opcode = OP_MSG if opcode == OP_MSG else OP_REPLY
+                self.request.sendall(HEADER.pack(HEADER.size + len(payload), 0, request_id, reply_opcode) + payload)
+        except ConnectionError:
+            return
+
+
+class Server(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=27099)
+    parser.add_argument("--latency-ms", type=float, default=2.0, help="modelled round trip added to every reply")
+    args = parser.parse_args()
+
+    fixtures.patch_mongomock()
+    with Server(("127.0.0.1", args.port), Handler) as server:
+        server.mock = MockServer(args.latency_ms / 1000)
+        print(f"mongomock listening on mongodb://127.0.0.1:{args.port} ({args.latency_ms:g} ms modelled latency)")
+        server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+"""
+Cross-source deduplication of scraped hackathons.
+
+The same event often shows up on Devpost, MLH and Devfolio with slightly
+different names. Records are blocked by start-date window (plus an exact
+normalized-name block for undated records), compared only within
+neighbouring blocks by trigram Jaccard similarity of their normalized
+names, and every matching cluster is merged into one canonical record that
+lists all its sources and apply links. Blocking keeps comparisons roughly
+linear in the number of records instead of quadratic. A cluster holds at
+most one record per source: two listings on the same site are different
+events, however similar their names.
+"""
+from collections import defaultdict
+from datetime import datetime
+
+from search_index import tokenize, trigrams
+
+# Preferred source for the canonical fields of a merged record
+SOURCE_PRIORITY = ("Devpost", "MLH", "Devfolio")
+
+# Name tokens that carry no identity ("HackX Hackathon 2025" == "HackX")
+STOP_TOKENS = {"the", "a", "an", "of", "hackathon", "hackathons"}
+
+SIMILARITY_THRESHOLD = 0.6
+DATE_WINDOW_DAYS = 3
+
+# Field values that count as "missing" when filling gaps from other sources
+EMPTY_VALUES = (None, "", "None", "Unknown", "Not available", 0)
+
+# Only filled from a record of the same mode (an online event has no venue to borrow)
+LOCATION_FIELDS = ("location", "city", "country", "geo")
+
+# Fields of a stored row that describe the row rather than one source's listing
+ROW_FIELDS = ("_id", "key", "content_hash", "sources", "apply_links")
+
+
+def normalize_name(name):
+    """Lowercased, accent- and punctuation-free name without stop words or years."""
+    tokens = [token for token in tokenize(name)
+              if token not in STOP_TOKENS and not (len(token) == 4 and token.startswith("20") and token.isdigit())]
+    return "".join(tokens)
+
+
+def name_similarity(grams_a, grams_b):
+    if not grams_a or not grams_b:
+        return 0.0
+    return len(grams_a & grams_b) / len(grams_a | grams_b)
+
+
+def _day_number(value):
+    if isinstance(value, datetime):
+        return value.toordinal()
+    return None
+
+
+def _priority(record):
+    source = record.get("source")
+    return SOURCE_PRIORITY.index(source) if source in SOURCE_PRIORITY else len(SOURCE_PRIORITY)
+
+
+def merge_records(records):
+    """Builds the canonical record of one cluster: best-priority source first, gaps filled from the rest."""
+    records = sorted(records, key=_priority)
+    canonical = dict(records[0])
+    for record in records[1:]:
+        same_mode = record.get("mode") == canonical.get("mode")
+        for field, value in record.items():
+            if field in LOCATION_FIELDS and not same_mode:
+                continue
+            if canonical.get(field) in EMPTY_VALUES and value not in EMPTY_VALUES:
+                canonical[field] = value
+
+    prizes = [record.get("prize_money") for record in records if isinstance(record.get("prize_money"), int)]
+    if prizes:
+        canonical["prize_money"] = max(prizes)
+
+    canonical["sources"] = []
+    canonical["apply_links"] = {}
+    for record in records:
+        for source in record.get("sources") or [record.get("source")]:
+            if source and source not in canonical["sources"]:
+                canonical["sources"].append(source)
+        if record.get("apply_link") and record.get("source") not in canonical["apply_links"]:
+            canonical["apply_links"][record["source"]] = record["apply_link"]
+    return canonical
+
+
+def source_record(row, source):
+    """
+    `source`'s listing as seen in a stored (possibly merged) row: the row's fields with
+    `source` and its apply link. Lets a source that was not re-scraped take part in a merge.
+    """
+    record = {field: value for field, value in row.items() if field not in ROW_FIELDS}
+    record["source"] = source
+    record["apply_link"] = (row.get("apply_links") or {}).get(source)
+    if record["apply_link"] is None and row.get("source") == source:
+        record["apply_link"] = row.get("apply_link")
+    return record
+
+
+def merge_hackathons(hackathons, threshold=SIMILARITY_THRESHOLD, window_days=DATE_WINDOW_DAYS):
+    """
+    Clusters near-duplicate hackathons across sources and returns one canonical
+    record per cluster, in the order clusters first appear. Each record is one
+    listing (one per source and key); the most similar pairs are joined first.
+    """
+    records = list(hackathons)
+    names = [normalize_name(record.get("name")) for record in records]
+    grams = [trigrams(name) if name else set() for name in names]
+
+    parent = list(range(len(records)))
+    cluster_sources = [{record.get("source")} for record in records]
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    def union(i, j):
+        root_i, root_j = find(i), find(j)
+        if root_i == root_j or cluster_sources[root_i] & cluster_sources[root_j]:
+            return
+        root, child = min(root_i, root_j), max(root_i, root_j)
+        parent[child] = root
+        cluster_sources[root] |= cluster_sources[child]
+
+    # Block by start-date window; undated records only match on an identical normalized name
+    date_blocks, name_blocks = defaultdict(list), defaultdict(list)
+    for i, record in enumerate(records):
+        day = _day_number(record.get("start_date"))
+        if day is None:
+            if names[i]:
+                name_blocks[names[i]].append(i)
+        else:
+            date_blocks[day // (window_days + 1)].append(i)
+
+    # Candidate pairs as (similarity, date distance, i, j)
+    pairs = []
+    for block, members in date_blocks.items():
+        neighbours = members + date_blocks.get(block + 1, [])
+        for position, i in enumerate(members):
+            day_i = _day_number(records[i]["start_date"])
+            for j in neighbours[position + 1:]:
+                distance = abs(_day_number(records[j]["start_date"]) - day_i)
+                if distance > window_days or records[i].get("source") == records[j].get("source"):
+                    continue
+                similarity = 1.0 if names[i] == names[j] else name_similarity(grams[i], grams[j])
+                if similarity >= threshold:
+                    pairs.append((similarity, distance, i, j))
+
+    for members in name_blocks.values():
+        for position, i in enumerate(members):
+            pairs.extend((1.0, 0, i, j) for j in members[position + 1:])
+
+    # Best matches first, so a record joins its closest counterpart from each other source
+    for _, _, i, j in sorted(pairs, key=lambda pair: (-pair[0], pair[1], pair[2], pair[3])):
+        union(i, j)
+
+    clusters = defaultdict(list)
+    for i in range(len(records)):
+        clusters[find(i)].append(records[i])
+    return [merge_records(clusters[root]) for root in sorted(clusters)]
@@ -1,94 +1,169 @@
-from scraper_utils import get_driver, get_mongo_client, By, WebDriverWait, datetime
+from scraper_utils import browser_session, get_mongo_client, normalize_dates, infinite_scroll, extract_cards, By, WebDriverWait
+from http_utils import fetch_json
+from scrape_report import stage
+from pipeline import Source, collect, normalize_records, register_source, scrape_and_store
+from normalize import iso, parse_day_month_year
 import logging
-import time
 
-def run_devfolio_scraper():
-    # Configure logging
-    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
-
-    # Initialize MongoDB connection
-    db = get_mongo_client()
-    collection = db["hackathons"]
-
-    # Initialize Selenium WebDriver
-    driver = get_driver()
-    if not driver:
-        logging.error("❌ WebDriver initialization failed. Exiting script.")
-        return
-
-    driver.get("https://devfolio.co/hackathons/open")
-    wait = WebDriverWait(driver, 10)
-
-    # Function to Auto-Scroll & Load More Hackathons
-    def auto_scroll():
-        last_height = driver.execute_script("return document.body.scrollHeight")
-        previous_count = 0
-        max_attempts = 10  # Limit retries to prevent infinite loops
-
-        while max_attempts > 0:
-            driver.execute_script("window.scrollBy(0, window.innerHeight);")  # Scroll down a bit
-            time.sleep(3)  # Wait for new content to load
-
-            cards = driver.find_elements(By.XPATH, '//*[@id="__next"]/div[2]/div[2]/div/div/div')
-            current_count = len(cards)
-
-            if current_count == previous_count:  # Stop if no new items are loaded
-                max_attempts -= 1  # Reduce attempts and try again
-            else:
-                max_attempts = 10  # Reset attempts if new items load
-
-            previous_count = current_count
-
-        logging.info(f"✅ Total Hackathons Loaded: {current_count}")
-
-    # Start Scrolling
-    auto_scroll()
-
-    # Extract Hackathon Details
-    hackathon_list = []
-    cards = driver.find_elements(By.XPATH, '//*[@id="__next"]/div[2]/div[2]/div/div/div')
-
-    for card in cards:
+DEVFOLIO_URL = "https://devfolio.co/hackathons/open"
+DEVFOLIO_API_URL = "https://api.devfolio.co/api/search/hackathons"
+DEVFOLIO_PAGE_SIZE = 50
+DEVFOLIO_CARDS_XPATH = '//*[@id="__next"]/div[2]/div[2]/div/div/div'
+
+# Card-relative XPaths of the fields we extract
+DEVFOLIO_FIELD_XPATHS = {
+    "name": './/div/div/div[1]/div[1]/div/a/h3',
+    "raw_start_date": './/div/div/div[3]/div/div[3]/p',
+    "apply_link": './/div/div/div[1]/div[1]/div/a',
+    "mode": './/div/div/div[3]/div/div[1]/p',
+}
+
+# Apply links of the cards in [arguments[2], arguments[3])
+DEVFOLIO_LINKS_JS = """
+const [cardsXPath, linkXPath, start, end] = arguments;
+const cards = document.evaluate(cardsXPath, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+const links = [];
+for (let i = start; i < Math.min(end, cards.snapshotLength); i++) {
+    const link = document.evaluate(linkXPath, cards.snapshotItem(i), null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    links.push(link ? link.href : null);
+}
+return links;
+"""
+
+# Collects every card's fields in one round trip (arguments[0] = cards XPath, arguments[1] = field XPaths)
+DEVFOLIO_EXTRACT_JS = """
+const [cardsXPath, fieldXPaths] = arguments;
+const first = (xpath, root) =>
+    document.evaluate(xpath, root, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+const cards = document.evaluate(cardsXPath, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+const result = [];
+for (let i = 0; i < cards.snapshotLength; i++) {
+    const card = cards.snapshotItem(i);
+    const nodes = Object.fromEntries(Object.entries(fieldXPaths).map(([field, xpath]) => [field, first(xpath, card)]));
+    result.push({
+        name: nodes.name ? nodes.name.innerText : null,
+        raw_start_date: nodes.raw_start_date ? nodes.raw_start_date.innerText : null,
+        apply_link: nodes.apply_link ? nodes.apply_link.href : null,
+        mode: nodes.mode ? nodes.mode.innerText.trim() : null,
+    });
+}
+return result;
+"""
+
+def build_hackathon(name, start_date, end_date, mode, location, apply_link):
+    """Builds a Devfolio hackathon document (shared by both backends)."""
+    return normalize_dates({
+        "name": name,
+        "start_date": start_date,
+        "end_date": end_date,
+        "mode": "Offline" if mode.lower() == "offline" else "Online",
+        "location": location or "Unknown",
+        "apply_link": apply_link,
+        "source": "Devfolio"
+    })
+
+def extract_cards_dom(driver, cards_xpath, field_xpaths):
+    """Per-element fallback for DEVFOLIO_EXTRACT_JS (one XPath lookup per field per card)."""
+    cards = []
+    for card in driver.find_elements(By.XPATH, cards_xpath):
         try:
-            name = card.find_element(By.XPATH, './/div/div/div[1]/div[1]/div/a/h3').text
-            raw_start_date = card.find_element(By.XPATH, './/div/div/div[3]/div/div[3]/p').text
-            apply_link = card.find_element(By.XPATH, './/div/div/div[1]/div[1]/div/a').get_attribute("href")
-            mode = card.find_element(By.XPATH, './/div/div/div[3]/div/div[1]/p').text.strip()
-
-            mode = "Offline" if mode.lower() == "offline" else "Online"
-
-            # Parse Start Date
-            try:
-                date_str = raw_start_date.replace("STARTS ", "").strip()
-                start_date = datetime.strptime(date_str, "%d/%m/%y").strftime("%Y-%m-%d")
-            except:
-                start_date = None  # Handle incorrect date formats
-
-            # Default values
-            end_date = None
-            location = "Unknown"
-
-            hackathon_data = {
-                "name": name,
-                "start_date": start_date,
-                "end_date": end_date,
-                "mode": mode,
-                "location": location,
-                "apply_link": apply_link,
-                "source": "Devfolio"
-            }
-
-            hackathon_list.append(hackathon_data)
-
+            cards.append({
+                "name": card.find_element(By.XPATH, field_xpaths["name"]).text,
+                "raw_start_date": card.find_element(By.XPATH, field_xpaths["raw_start_date"]).text,
+                "apply_link": card.find_element(By.XPATH, field_xpaths["apply_link"]).get_attribute("href"),
+                "mode": card.find_element(By.XPATH, field_xpaths["mode"]).text.strip(),
+            })
         except Exception as e:
             logging.warning(f"⚠️ Error extracting details for a hackathon: {e}")
+    return cards
+
+@register_source
+class DevfolioSource(Source):
+    """Devfolio: the search API behind the open-hackathons page, or the page itself in a browser."""
+
+    name = "Devfolio"
+    required_fields = tuple(DEVFOLIO_FIELD_XPATHS)
+
+    def pages(self, session, state):
+        """Pages of the Devfolio search API (what the open-hackathons page queries as it scrolls)."""
+        offset = 0
+        while True:
+            payload = fetch_json(session, DEVFOLIO_API_URL, method="POST",
+                                 json={"type": "application_open", "from": offset, "size": DEVFOLIO_PAGE_SIZE})
+            hits = payload.get("hits", {}).get("hits", [])
+            if not hits:
+                return
+            yield payload
+            if len(hits) < DEVFOLIO_PAGE_SIZE:
+                return
+            offset += DEVFOLIO_PAGE_SIZE
+
+    def parse(self, payload):
+        records = []
+        for hit in payload.get("hits", {}).get("hits", []):
+            item = hit.get("_source", {})
+            try:
+                mode = "Online" if item.get("is_online") else "Offline"
+                records.append({
+                    "name": item["name"],
+                    "start_date": (item.get("starts_at") or "")[:10] or None,
+                    "end_date": (item.get("ends_at") or "")[:10] or None,
+                    "mode": mode,
+                    "location": None if mode == "Online" else (item.get("city") or item.get("location")),
+                    "apply_link": f"https://{item['slug']}.devfolio.co/",
+                })
+            except Exception as e:
+                logging.warning(f"⚠️ Error extracting details for a hackathon: {e}")
+        return records
+
+    def browser_pages(self, state):
+        """Scrolls the open-hackathons page until it stops loading (or, on incremental runs, reaches a fully known batch)."""
+        with browser_session() as driver:
+            with stage("page_load"):
+                driver.get(DEVFOLIO_URL)
+                WebDriverWait(driver, 10).until(lambda d: d.find_elements(By.XPATH, DEVFOLIO_CARDS_XPATH))
+
+            def reached_known(previous_count, count):
+                links = driver.execute_script(DEVFOLIO_LINKS_JS, DEVFOLIO_CARDS_XPATH,
+                                              DEVFOLIO_FIELD_XPATHS["apply_link"], previous_count, count)
+                if state and state.knows_all([{"apply_link": link} for link in links]):
+                    state.stop_early("scrolled into already-known hackathons")
+                    return True
+                return False
+
+            total = infinite_scroll(driver, f"document.evaluate('{DEVFOLIO_CARDS_XPATH}', document, null, "
+                                            "XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null).snapshotLength",
+                                    should_stop=reached_known if state else None)
+            logging.info(f"✅ Total Hackathons Loaded: {total}")
+            cards = extract_cards(driver, DEVFOLIO_EXTRACT_JS, extract_cards_dom, DEVFOLIO_CARDS_XPATH, DEVFOLIO_FIELD_XPATHS)
+        yield cards
+
+    def parse_cards(self, cards):
+        # Start dates read "STARTS 01/03/25" (None for incorrect date formats); cards carry no end date or city
+        return [{
+            "name": card["name"],
+            "start_date": iso(parse_day_month_year(card["raw_start_date"])),
+            "end_date": None,
+            "mode": card["mode"],
+            "location": None,
+            "apply_link": card["apply_link"],
+        } for card in super().parse_cards(cards)]
+
+    def normalize(self, record):
+        return build_hackathon(record["name"].strip(), record["start_date"], record["end_date"], record["mode"],
+                               record["location"], record["apply_link"])
+
+def parse_devfolio_api(payload):
+    """Parses one page of the Devfolio search API into hackathon documents (parse and normalize stages)."""
+    source = DevfolioSource()
+    return normalize_records(source, source.parse(payload))
+
+def collect_devfolio_hackathons(db):
+    """Scrapes Devfolio (HTTP first, Selenium as fallback). Returns (hackathons, state)."""
+    return collect(DevfolioSource(), db)
 
-    # Insert into MongoDB (Avoid Duplicates)
-    if hackathon_list:
-        collection.insert_many(hackathon_list)  # Use the correct list name
-        logging.info(f"✅ Successfully stored {len(hackathon_list)} new hackathons in MongoDB!")
-    else:
-        logging.error("❌ No hackathons extracted. Check for issues.")
-
-    driver.quit()
-    logging.info("🚪 WebDriver closed.")
+def run_devfolio_scraper():
+    """Scrapes open hackathons from Devfolio and stores them in MongoDB. Returns the number stored."""
+    # Configure logging
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    return scrape_and_store(DevfolioSource(), get_mongo_client())
@@ -1,6 +1,37 @@
-from scraper_utils import get_driver, get_mongo_client, By, WebDriverWait, EC, datetime, re, Keys
+from scraper_utils import browser_session, get_mongo_client, normalize_dates, infinite_scroll, extract_cards, By, WebDriverWait, EC
+from http_utils import fetch_json, strip_tags
+from scrape_report import stage
+from pipeline import Source, collect, normalize_records, register_source, scrape_and_store
+from normalize import parse_date_range, parse_prize
 import logging
-import time
+
+DEVPOST_URL = "https://devpost.com/hackathons"
+DEVPOST_API_URL = "https://devpost.com/api/hackathons"
+TARGET_COUNT = 100  # Adjust as needed
+
+# Apply links of the tiles in [arguments[0], arguments[1])
+DEVPOST_LINKS_JS = """
+return Array.from(document.getElementsByClassName('hackathon-tile')).slice(arguments[0], arguments[1])
+    .map(tile => { const link = tile.querySelector('a'); return link ? link.href : null; });
+"""
+
+# Collects every tile's raw fields in one round trip (arguments[0] = max tiles)
+DEVPOST_EXTRACT_JS = """
+const text = (root, selector) => {
+    const el = root.querySelector(selector);
+    return el ? el.innerText.trim() : null;
+};
+return Array.from(document.getElementsByClassName('hackathon-tile')).slice(0, arguments[0]).map(tile => {
+    const link = tile.querySelector('a');
+    return {
+        name: text(tile, 'h3.mb-4'),
+        date_text: text(tile, '.submission-period'),
+        location_info: text(tile, '.info'),
+        prize_text: text(tile, '.prize-amount'),
+        apply_link: link ? link.href : null,
+    };
+});
+"""
 
 # Refined Function to Extract Dates
 def extract_dates(date_text):
@@ -10,50 +41,23 @@ def extract_dates(date_text):
     - "Feb 01 - 26, 2025"
     - "Dec 18, 2024 - Mar 02, 2025"
     - "Mar 02, 2025"
-    Returns dates in ISO format (YYYY-MM-DD).
+    Returns dates in ISO format (YYYY-MM-DD), or "Not available" for both.
+    Parsing is shared with the other scrapers (see normalize.parse_date_range).
     """
-
-    # If the date is "Not available", return the same
-    if "Not available" in date_text:
+    start_date, end_date = parse_date_range(date_text)
+    if start_date is None:
         return "Not available", "Not available"
+    return start_date.isoformat(), (end_date or start_date).isoformat()
 
-    current_year = datetime.now().year  # To infer missing years
-
-    # Case 1: Match "Jan 31 - Mar 02, 2025"
-    date_match = re.match(r"(\w{3} \d{1,2}) - (\w{3} \d{1,2}), (\d{4})", date_text)
-    if date_match:
-        start_day_month, end_day_month, year = date_match.groups()
-        start_date = datetime.strptime(f"{start_day_month} {year}", "%b %d %Y")
-        end_date = datetime.strptime(f"{end_day_month} {year}", "%b %d %Y")
-        return start_date.date().isoformat(), end_date.date().isoformat()
-
-    # Case 2: Match "Feb 01 - 26, 2025" or "Feb 01 - 26"
-    date_match = re.match(r"(\w{3} \d{1,2}) - (\d{1,2}), (\d{4})", date_text)
-    if date_match:
-        start_day_month, end_day, year = date_match.groups()
-        start_date = datetime.strptime(f"{start_day_month} {year}", "%b %d %Y")
-        end_date = datetime.strptime(f"{start_day_month[:3]} {end_day} {year}", "%b %d %Y")
-        return start_date.date().isoformat(), end_date.date().isoformat()
-
-    # Case 3: Match "Dec 18, 2024 - Mar 02, 2025"
-    date_match = re.match(r"(\w{3} \d{1,2}, \d{4}) - (\w{3} \d{1,2}, \d{4})", date_text)
-    if date_match:
-        start_date_str, end_date_str = date_match.groups()
-        start_date = datetime.strptime(start_date_str, "%b %d, %Y")
-        end_date = datetime.strptime(end_date_str, "%b %d, %Y")
-        return start_date.date().isoformat(), end_date.date().isoformat()
-
-    # Case 4: Match a single date, "Mar 02, 2025"
-    date_match = re.match(r"(\w{3} \d{1,2}, \d{4})", date_text)
-    if date_match:
-        start_date_str = date_match.group(1)
-        start_date = datetime.strptime(start_date_str, "%b %d, %Y")
-        return start_date.date().isoformat(), start_date.date().isoformat()
-
-    # If none of the formats match, return "Not available"
-    return "Not available", "Not available"
-
+# Refined Function to Parse Prize Money
+def parse_prize_text(prize_text):
+    """
+    Parses a prize label such as "$10,000", "$5K" or "Between $5K and $10K".
 
+    Returns:
+        int: The prize amount in integer format (the highest amount for ranges). Returns 0 if no valid prize is found.
+    """
+    return parse_prize(prize_text)
 
 # Refined Function to Extract Prize Money
 def extract_prize_money(event):
@@ -67,127 +71,118 @@ def extract_prize_money(event):
         int: The prize amount in integer format. Returns 0 if no valid prize is found.
     """
     try:
-        prize_text = event.find_element(By.CLASS_NAME, "prize-amount").text.strip()
-        prize_text = prize_text.lower().replace(",", "").replace("usd", "").strip()
-
-        # Handle prize ranges (e.g., "Between $5K and $10K")
-        range_match = re.findall(r'(\d+(\.\d+)?)([km]?)', prize_text)
-        if range_match:
-            amounts = []
-            for num, _, suffix in range_match:
-                num = float(num)
-                if suffix == "k":
-                    num *= 1000
-                elif suffix == "m":
-                    num *= 1_000_000
-                amounts.append(int(num))
-            return max(amounts)  # Return the highest prize in the range
-
-        # Handle single prize cases (e.g., "$10K", "5M")
-        match = re.search(r'(\d+(\.\d+)?)([km]?)', prize_text)
-        if match:
-            amount = float(match.group(1))
-            suffix = match.group(3)
-            if suffix == "k":
-                amount *= 1000
-            elif suffix == "m":
-                amount *= 1_000_000
-            return int(amount)
-
-        return 0  # No valid prize found
-
+        return parse_prize_text(event.find_element(By.CLASS_NAME, "prize-amount").text.strip())
     except Exception:
         return 0  # Return 0 if prize money is not mentioned
 
-# Configure logging
-logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
-
-def run_devpost_scraper():
-    """Scrapes hackathon data from Devpost and stores it in MongoDB."""
-    
-    logging.info("Starting Devpost scraper...")
-
-    # Initialize MongoDB connection
-    db = get_mongo_client()
-    collection = db["hackathons"]
-
-    # Initialize Selenium WebDriver
-    driver = get_driver()
-    driver.get("https://devpost.com/hackathons")
-
-    # Ensure Initial Content Loads
-    WebDriverWait(driver, 15).until(EC.presence_of_all_elements_located((By.CLASS_NAME, "hackathon-tile")))
-
-    # Dynamic Scrolling to Load More Hackathons
-    TARGET_COUNT = 100  # Adjust as needed
-    scroll_attempts, max_attempts = 0, 30
-    prev_count = 0
-
-    while True:
-        events = driver.find_elements(By.CLASS_NAME, "hackathon-tile")
-        current_count = len(events)
-
-        if current_count >= TARGET_COUNT:
-            logging.info(f"✅ Loaded {current_count} hackathons. Stopping scroll.")
-            break
-
-        if current_count == prev_count:
-            scroll_attempts += 1
-            if scroll_attempts >= max_attempts:
-                logging.warning("⚠️ No more hackathons found. Stopping.")
-                break
-
-        prev_count = current_count
-
-        # Scroll Down using PAGE_DOWN multiple times before scrolling into view
-        for _ in range(3):
-            driver.find_element(By.TAG_NAME, "body").send_keys(Keys.PAGE_DOWN)
-            time.sleep(1)
-
-        if events:
-            driver.execute_script("arguments[0].scrollIntoView();", events[-1])
-
-        time.sleep(3)  # Allow time for new hackathons to load
-        logging.info(f"🔄 Scroll Attempt {scroll_attempts}: Found {current_count} hackathons.")
-
-    scraped_events = []
-    for event in events[:TARGET_COUNT]:
+def build_hackathon(name, date_text, location_info, prize, apply_link):
+    """Builds a Devpost hackathon document from the raw listing fields (shared by both backends)."""
+    start_date, end_date = extract_dates(date_text)
+
+    # Extract Mode & Location
+    mode = "Online" if "online" in location_info.lower() else "Offline"
+    location = "None" if mode == "Online" else location_info
+
+    return normalize_dates({
+        "name": name,
+        "start_date": start_date,
+        "end_date": end_date,
+        "mode": mode,
+        "location": location,
+        "prize_money": prize,
+        "apply_link": apply_link,
+        "source": "Devpost"
+    })
+
+def extract_tiles_dom(driver, target_count):
+    """Per-element fallback for DEVPOST_EXTRACT_JS (several WebDriver calls per tile)."""
+    tiles = []
+    for event in driver.find_elements(By.CLASS_NAME, "hackathon-tile")[:target_count]:
         try:
-            driver.execute_script("arguments[0].scrollIntoView();", event)
-            time.sleep(1)
-            name = event.find_element(By.CSS_SELECTOR, "h3.mb-4").text
-            date_text = event.find_element(By.CLASS_NAME, "submission-period").text  
-            start_date, end_date = extract_dates(date_text)
-
-            # Extract Mode & Location
-            location_info = event.find_element(By.CLASS_NAME, "info").text
-            mode = "Online" if "online" in location_info.lower() else "Offline"
-            location = "None" if mode == "Online" else location_info
-
-            # Extract Prize Money
-            prize = extract_prize_money(event)
-
-            # Extract Apply Link
-            apply_link = event.find_element(By.TAG_NAME, "a").get_attribute("href")
-
-            scraped_events.append({
-                "name": name,
-                "start_date": start_date,
-                "end_date": end_date,
-                "mode": mode,
-                "location": location,
-                "prize_money": prize,
-                "apply_link": apply_link,
-                "source": "Devpost"
+            try:
+                prize_text = event.find_element(By.CLASS_NAME, "prize-amount").text.strip()
+            except Exception:
+                prize_text = None
+            tiles.append({
+                "name": event.find_element(By.CSS_SELECTOR, "h3.mb-4").text,
+                "date_text": event.find_element(By.CLASS_NAME, "submission-period").text,
+                "location_info": event.find_element(By.CLASS_NAME, "info").text,
+                "prize_text": prize_text,
+                "apply_link": event.find_element(By.TAG_NAME, "a").get_attribute("href"),
             })
         except Exception as e:
             logging.error(f"Skipping one event due to error: {e}")
+    return tiles
+
+@register_source
+class DevpostSource(Source):
+    """Devpost: the JSON API behind the listing page, or the listing page itself in a browser."""
+
+    name = "Devpost"
+    limit = TARGET_COUNT
+    required_fields = ("name", "date_text", "location_info", "apply_link")
+
+    def pages(self, session, state):
+        """Pages of https://devpost.com/api/hackathons (the same endpoint the listing page loads as you scroll)."""
+        page = 1
+        while True:
+            payload = fetch_json(session, DEVPOST_API_URL, params={"page": page, "status[]": ["upcoming", "open"]})
+            if not payload.get("hackathons"):
+                return
+            logging.info(f"🔄 Devpost API page {page}: {len(payload['hackathons'])} hackathons.")
+            yield payload
+            page += 1
+
+    def parse(self, payload):
+        return [{
+            "name": item.get("title"),
+            "date_text": item.get("submission_period_dates") or "Not available",
+            "location_info": (item.get("displayed_location") or {}).get("location") or "",
+            "prize_text": strip_tags(item.get("prize_amount")),
+            "apply_link": item.get("url"),
+        } for item in payload.get("hackathons", [])]
+
+    def browser_pages(self, state):
+        """Scrolls the listing page until TARGET_COUNT tiles (or, on incremental runs, a fully known batch) are loaded."""
+        with browser_session() as driver:
+            with stage("page_load"):
+                driver.get(DEVPOST_URL)
+
+                # Ensure Initial Content Loads
+                WebDriverWait(driver, 15).until(EC.presence_of_all_elements_located((By.CLASS_NAME, "hackathon-tile")))
+
+            def reached_known(previous_count, count):
+                links = driver.execute_script(DEVPOST_LINKS_JS, previous_count, count)
+                if state and state.knows_all([{"apply_link": link} for link in links]):
+                    state.stop_early("scrolled into already-known hackathons")
+                    return True
+                return False
+
+            infinite_scroll(driver, "document.getElementsByClassName('hackathon-tile').length",
+                            target_count=self.limit, should_stop=reached_known if state else None)
+            tiles = extract_cards(driver, DEVPOST_EXTRACT_JS, extract_tiles_dom, self.limit)
+        yield tiles
+
+    def normalize(self, record):
+        return build_hackathon(
+            name=record["name"].strip(),
+            date_text=record["date_text"],
+            location_info=record["location_info"],
+            prize=parse_prize_text(record["prize_text"]) if record.get("prize_text") else 0,
+            apply_link=record["apply_link"],
+        )
+
+def parse_devpost_api(payload):
+    """Parses one page of the Devpost API into hackathon documents (parse and normalize stages)."""
+    source = DevpostSource()
+    return normalize_records(source, source.parse(payload))
+
+def collect_devpost_hackathons(db):
+    """Scrapes Devpost (HTTP first, Selenium as fallback). Returns (hackathons, state)."""
+    return collect(DevpostSource(), db)
 
-    # Insert Data into MongoDB
-    if scraped_events:
-        collection.delete_many({})  # Delete existing data
-        logging.info("Deleted existing hackathon data. Storing fresh data.")
-        collection.insert_many(scraped_events)
-        logging.info(f"{len(scraped_events)} hackathons stored in MongoDB successfully! 🚀")
-
-    driver.quit()
+def run_devpost_scraper():
+    """Scrapes hackathon data from Devpost and stores it in MongoDB. Returns the number stored."""
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    logging.info("Starting Devpost scraper...")
+    return scrape_and_store(DevpostSource(), get_mongo_client())
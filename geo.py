@@ -0,0 +1,110 @@
+"""
+Offline geocoding of the free-text locations the scrapers collect.
+
+Locations such as "London, UK", "Bengaluru, Karnataka, India" or "Toronto, ON"
+are resolved against a gazetteer of hackathon cities (data/gazetteer.csv, or
+GEO_GAZETTEER_PATH) into a canonical city and country plus a GeoJSON point for
+the `2dsphere` index behind /hackathons/nearby. The gazetteer is read once
+and lookups are memoized, since the same strings repeat across cards and runs.
+Placeholders ("Unknown", "None", "Everywhere", "Online") and unknown places
+resolve to None.
+"""
+import csv
+import os
+import re
+import unicodedata
+from collections import namedtuple
+from functools import lru_cache
+
+GAZETTEER_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "gazetteer.csv")
+
+PLACEHOLDERS = {"", "none", "unknown", "everywhere", "online", "virtual", "remote", "worldwide", "tba",
+                "not available", "digital only"}
+
+# Spellings of countries that are neither their gazetteer name nor their ISO code
+COUNTRY_ALIASES = {
+    "US": ("usa", "united states of america", "america"),
+    "GB": ("uk", "great britain", "britain", "england", "scotland", "wales"),
+    "AE": ("uae",),
+    "CZ": ("czech republic",),
+    "TR": ("turkey",),
+    "KR": ("korea", "republic of korea"),
+}
+
+CACHE_SIZE = 4096
+
+# A location is split into parts at commas, slashes, pipes, parentheses and " - "
+_PARTS = re.compile(r"[,/|()]|\s-\s")
+
+Place = namedtuple("Place", "city country country_code lat lon qualifiers")
+
+
+def _key(text):
+    """Lookup key: lowercase ASCII without accents or dots, single-spaced."""
+    text = unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode()
+    return " ".join(text.replace(".", "").lower().split())
+
+
+@lru_cache(maxsize=1)
+def gazetteer():
+    """{city key: [Place, ...]} (in file order, so the first place wins when nothing disambiguates)."""
+    path = os.getenv("GEO_GAZETTEER_PATH", GAZETTEER_PATH)
+    places = {}
+    with open(path, newline="", encoding="utf-8") as gazetteer_file:
+        for row in csv.DictReader(gazetteer_file):
+            code = row["country_code"]
+            qualifiers = {_key(row["country"]), _key(code), *COUNTRY_ALIASES.get(code, ())}
+            qualifiers.update(_key(region) for region in row["region"].split("|") if region)
+            place = Place(row["city"], row["country"], code, float(row["lat"]), float(row["lon"]), frozenset(qualifiers))
+            names = [row["city"]] + [alias for alias in row["aliases"].split("|") if alias]
+            for name in names:
+                places.setdefault(_key(name), []).append(place)
+    return places
+
+
+@lru_cache(maxsize=1)
+def _known_qualifiers():
+    return frozenset(qualifier for places in gazetteer().values() for place in places for qualifier in place.qualifiers)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def resolve(location):
+    """
+    The Place named by a location string, or None. The first part naming a gazetteer
+    city wins; the other parts (state, province, country) pick between cities of the
+    same name, and a part naming a different known country or region rejects the city.
+    """
+    if not location:
+        return None
+    parts = [_key(part) for part in _PARTS.split(location)]
+    parts = [part for part in parts if part]
+    if not parts or parts[0] in PLACEHOLDERS:
+        return None
+
+    known = _known_qualifiers()
+    for part in parts:
+        candidates = gazetteer().get(part)
+        if not candidates:
+            continue
+        qualifiers = {other for other in parts if other != part and other in known}
+        if not qualifiers:
+            return candidates[0]
+        for place in candidates:
+            if qualifiers & place.qualifiers:
+                return place
+    return None
+
+
+def geocode(hackathon):
+    """Adds `city`, `country` and a GeoJSON `geo` point to a hackathon whose location resolves (in place)."""
+    place = resolve(hackathon.get("location"))
+    if place is not None:
+        hackathon["city"] = place.city
+        hackathon["country"] = place.country
+        hackathon["geo"] = point(place.lat, place.lon)
+    return hackathon
+
+
+def point(lat, lon):
+    """GeoJSON point for a latitude/longitude pair (GeoJSON orders longitude first)."""
+    return {"type": "Point", "coordinates": [lon, lat]}
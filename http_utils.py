@@ -0,0 +1,76 @@
+import html
+import re
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from scrape_report import stage
+
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/110.0.0.0 Safari/537.36"
+)
+DEFAULT_TIMEOUT = 15
+
+_TAG_RE = re.compile(r"<[^>]+>")
+_SPACE_RE = re.compile(r"\s+")
+
+
+def get_session(pool_size=4, retries=3):
+    """
+    Returns a requests Session with keep-alive connection pooling and retries
+    (with backoff) on connection errors and 429/5xx responses.
+    """
+    session = requests.Session()
+    retry = Retry(
+        total=retries,
+        backoff_factor=0.5,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=frozenset({"GET", "POST"}),
+    )
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({"User-Agent": USER_AGENT, "Accept-Language": "en-US,en;q=0.9"})
+    return session
+
+
+def fetch_json(session, url, method="GET", **kwargs):
+    """Fetches `url` and decodes the JSON body. Raises for non-2xx responses."""
+    kwargs.setdefault("timeout", DEFAULT_TIMEOUT)
+    with stage("http_fetch"):
+        response = session.request(method, url, headers={"Accept": "application/json"}, **kwargs)
+    response.raise_for_status()
+    return response.json()
+
+
+def fetch_html(session, url, **kwargs):
+    """Fetches a server-rendered page and returns its HTML. Raises for non-2xx responses."""
+    return fetch_html_conditional(session, url, **kwargs)[0]
+
+
+def fetch_html_conditional(session, url, etag=None, last_modified=None, **kwargs):
+    """
+    Conditional GET: sends If-None-Match / If-Modified-Since when validators are known.
+    Returns (html, etag, last_modified); html is None on 304 Not Modified.
+    """
+    kwargs.setdefault("timeout", DEFAULT_TIMEOUT)
+    headers = {"Accept": "text/html"}
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+    with stage("http_fetch"):
+        response = session.get(url, headers=headers, **kwargs)
+    if response.status_code == 304:
+        return None, etag, last_modified
+    response.raise_for_status()
+    return response.text, response.headers.get("ETag"), response.headers.get("Last-Modified")
+
+
+def strip_tags(fragment):
+    """Plain text of an HTML fragment, e.g. '$<span>10,000</span>' -> '$10,000'."""
+    if not fragment:
+        return ""
+    return _SPACE_RE.sub(" ", html.unescape(_TAG_RE.sub("", fragment))).strip()
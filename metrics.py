@@ -0,0 +1,255 @@
+"""
+Lightweight request instrumentation with a Prometheus text endpoint.
+
+Per route it records request latency, the time spent in MongoDB commands
+(from a PyMongo command listener) and in JSON serialization, response sizes
+and item counts; MongoDB commands slower than MONGO_SLOW_QUERY_MS are logged
+with their filter document. Metrics live in the serving process, so each
+gunicorn/uvicorn worker exposes its own counters.
+"""
+import bisect
+import contextvars
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from pymongo import monitoring
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds (seconds) of the latency buckets
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+ITEM_BUCKETS = (0, 1, 10, 50, 100, 250, 500, 1000, 5000, 10000)
+
+# Command fields that hold the query shape worth logging
+QUERY_FIELDS = ("filter", "pipeline", "query", "q", "updates", "deletes")
+
+METRICS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _label_text(labelnames, values):
+    if not labelnames:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in zip(labelnames, values)) + "}"
+
+
+class Counter:
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = tuple(labels.get(name, "") for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_label_text(self.labelnames, key)} {value}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self._series = {}   # label values -> [bucket counts..., +Inf count, sum]
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = tuple(labels.get(name, "") for name in self.labelnames)
+        position = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0] * (len(self.buckets) + 2)
+            series[position] += 1
+            series[-1] += value
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            snapshot = sorted((key, list(series)) for key, series in self._series.items())
+        labelnames = self.labelnames + ("le",)
+        for key, series in snapshot:
+            cumulative = 0
+            for bound, count in zip(self.buckets + ("+Inf",), series[:-1]):
+                cumulative += count
+                lines.append(f"{self.name}_bucket{_label_text(labelnames, key + (bound,))} {cumulative}")
+            lines.append(f"{self.name}_sum{_label_text(self.labelnames, key)} {series[-1]}")
+            lines.append(f"{self.name}_count{_label_text(self.labelnames, key)} {cumulative}")
+        return lines
+
+
+class Sampled:
+    """A counter or gauge whose value is read from `read()` at scrape time."""
+
+    def __init__(self, name, documentation, kind, read):
+        self.name = name
+        self.documentation = documentation
+        self.kind = kind
+        self.read = read
+
+    def render(self):
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}",
+                f"{self.name} {self.read()}"]
+
+
+class Registry:
+    def __init__(self):
+        self.metrics = []
+
+    def register(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def render(self):
+        lines = []
+        for metric in self.metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+REQUEST_SECONDS = registry.register(Histogram(
+    "http_request_duration_seconds", "Request latency by route.", ("route", "method", "status")))
+STAGE_SECONDS = registry.register(Histogram(
+    "http_request_stage_seconds", "Time per request spent in MongoDB, JSON serialization and everything else.",
+    ("route", "stage")))
+RESPONSE_BYTES = registry.register(Histogram(
+    "http_response_size_bytes", "Response body size (Flask: non-streamed responses only).", ("route",), SIZE_BUCKETS))
+RESPONSE_ITEMS = registry.register(Histogram(
+    "http_response_items", "Hackathons returned per response.", ("route",), ITEM_BUCKETS))
+MONGO_SECONDS = registry.register(Histogram(
+    "mongo_command_duration_seconds", "MongoDB command round-trip time.", ("command",)))
+MONGO_FAILURES = registry.register(Counter(
+    "mongo_command_failures_total", "Failed MongoDB commands.", ("command",)))
+SLOW_QUERIES = registry.register(Counter(
+    "mongo_slow_commands_total", "MongoDB commands slower than MONGO_SLOW_QUERY_MS.", ("command",)))
+
+
+class RequestTimer:
+    """Accumulates the stages of one request; the active one lives in a context variable."""
+
+    def __init__(self, route, method):
+        self.route = route
+        self.method = method
+        self.started = time.perf_counter()
+        self.stages = {"mongo": 0.0, "serialize": 0.0}
+        self.items = None
+
+    def finish(self, status, size=None):
+        total = time.perf_counter() - self.started
+        if _current.get() is self:
+            _current.set(None)
+        REQUEST_SECONDS.observe(total, route=self.route, method=self.method, status=status)
+        for stage, seconds in self.stages.items():
+            STAGE_SECONDS.observe(seconds, route=self.route, stage=stage)
+        STAGE_SECONDS.observe(max(total - sum(self.stages.values()), 0.0), route=self.route, stage="other")
+        if size is not None:
+            RESPONSE_BYTES.observe(size, route=self.route)
+        if self.items is not None:
+            RESPONSE_ITEMS.observe(self.items, route=self.route)
+
+
+_current = contextvars.ContextVar("request_timer", default=None)
+
+
+def start_request(route, method):
+    """Starts timing a request in the current context and returns its timer."""
+    timer = RequestTimer(route, method)
+    _current.set(timer)
+    return timer
+
+
+@contextmanager
+def stage(name):
+    """Adds the time spent in the block to stage `name` of the current request (no-op outside one)."""
+    timer = _current.get()
+    if timer is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timer.stages[name] = timer.stages.get(name, 0.0) + time.perf_counter() - started
+
+
+def record_items(count):
+    timer = _current.get()
+    if timer is not None:
+        timer.items = count
+
+
+class MongoCommandMetrics(monitoring.CommandListener):
+    """
+    Times every MongoDB command, charges it to the current request's "mongo"
+    stage and logs commands slower than `slow_ms` with their filter document.
+    """
+
+    def __init__(self, slow_ms):
+        self.slow_ms = slow_ms
+        self._queries = {}
+
+    def started(self, event):
+        if self.slow_ms is not None:
+            query = {field: event.command[field] for field in QUERY_FIELDS if field in event.command}
+            self._queries[(event.connection_id, event.request_id)] = (event.command.get(event.command_name), query)
+
+    def _finish(self, event, failed):
+        seconds = event.duration_micros / 1e6
+        MONGO_SECONDS.observe(seconds, command=event.command_name)
+        if failed:
+            MONGO_FAILURES.inc(command=event.command_name)
+        timer = _current.get()
+        if timer is not None:
+            timer.stages["mongo"] += seconds
+
+        collection, query = self._queries.pop((event.connection_id, event.request_id), (None, None))
+        if self.slow_ms is not None and seconds * 1000 >= self.slow_ms:
+            SLOW_QUERIES.inc(command=event.command_name)
+            logger.warning(f"🐢 Slow MongoDB {event.command_name} on {collection}: {seconds * 1000:.0f} ms {query}")
+
+    def succeeded(self, event):
+        self._finish(event, failed=False)
+
+    def failed(self, event):
+        self._finish(event, failed=True)
+
+
+def install_mongo_listener():
+    """
+    Registers the command listener for every MongoClient created afterwards.
+    MONGO_SLOW_QUERY_MS (default 200) sets the slow-query threshold; an empty value disables the log.
+    """
+    threshold = os.getenv("MONGO_SLOW_QUERY_MS", "200")
+    monitoring.register(MongoCommandMetrics(float(threshold) if threshold else None))
+
+
+def register_cache(cache):
+    """Exports a ResponseCache's hit and miss counters and hit ratio."""
+    registry.register(Sampled("response_cache_hits_total", "Response cache hits.", "counter", lambda: cache.hits))
+    registry.register(Sampled("response_cache_misses_total", "Response cache misses.", "counter", lambda: cache.misses))
+    registry.register(Sampled(
+        "response_cache_hit_ratio", "Response cache hits / lookups.", "gauge",
+        lambda: cache.hits / (cache.hits + cache.misses) if cache.hits + cache.misses else 0))
+
+
+def render():
+    return registry.render()
@@ -1,99 +1,212 @@
-from scraper_utils import get_driver, get_mongo_client, By, WebDriverWait, EC, datetime, re, Keys
+from scraper_utils import browser_session, get_mongo_client, normalize_dates, NotModified, extract_cards, By, WebDriverWait, EC
+from http_utils import fetch_html_conditional
+from scrape_report import stage
+from pipeline import Source, collect, normalize_records, register_source, scrape_and_store
+import normalize
+from html.parser import HTMLParser
+from urllib.parse import urljoin
 import logging
 import traceback
 
-# Configure logging
-logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+MLH_URL = "https://mlh.io/seasons/2025/events"
 
-# Initialize MongoDB connection
-db = get_mongo_client()
-collection = db["hackathons"]
+# CSS classes of the event fields on the MLH season page
+MLH_FIELD_CLASSES = ("event-name", "event-date", "event-location", "event-hybrid-notes")
+# Collects the upcoming events (first `container feature` section with events) in one round trip
+MLH_EXTRACT_JS = """
+const text = (root, cls) => {
+    const el = root.getElementsByClassName(cls)[0];
+    return el ? el.innerText.trim() : null;
+};
+for (const container of document.querySelectorAll('.container.feature')) {
+    const row = container.querySelector('.row');
+    const wrappers = row ? row.getElementsByClassName('event-wrapper') : [];
+    if (!wrappers.length) continue;
+    return Array.from(wrappers).map(event => {
+        const link = event.querySelector('a');
+        return {
+            name: text(event, 'event-name'),
+            date_text: text(event, 'event-date'),
+            location: text(event, 'event-location'),
+            website: link ? link.href : null,
+            mode: text(event, 'event-hybrid-notes') || 'Unknown',
+        };
+    });
+}
+return [];
+"""
+
+VOID_TAGS = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "source", "track", "wbr"}
 
 def parse_mlh_date(date_text):
-    try:
-        current_year = datetime.today().year
-        date_text = re.sub(r"(ST|ND|RD|TH)", "", date_text, flags=re.IGNORECASE)
-        date_pattern = r"([A-Za-z]+) (\d{1,2})\s*-\s*((?:[A-Za-z]+ )?\d{1,2})"
-        match = re.match(date_pattern, date_text.strip())
-        if match:
-            start_month_name, start_day, end_part = match.groups()
-            start_month_number = datetime.strptime(start_month_name[:3], "%b").month
-            start_date = datetime(current_year, start_month_number, int(start_day)).strftime("%Y-%m-%d")
-            end_match = re.match(r"([A-Za-z]+ )?(\d{1,2})", end_part.strip())
-            if end_match:
-                end_month_name, end_day = end_match.groups()
-                end_month_number = datetime.strptime(end_month_name[:3], "%b").month if end_month_name else start_month_number
-                end_date = datetime(current_year, end_month_number, int(end_day)).strftime("%Y-%m-%d")
-            else:
-                end_date = start_date
-            return start_date, end_date
-    except Exception as e:
-        logging.error(f"Error parsing date: {date_text}, Error: {e}")
-    return None, None
+    """Parses an MLH date range ("Jan 10th - 12th") into ISO start/end dates (see normalize.parse_mlh_date)."""
+    start_date, end_date = normalize.parse_mlh_date(date_text)
+    if start_date is None:
+        logging.error(f"Error parsing date: {date_text}")
+    return normalize.iso(start_date), normalize.iso(end_date)
 
-def run_mlh_scraper():
-    driver = get_driver(undetected=True)
-    try:
-        url = "https://mlh.io/seasons/2025/events"
-        driver.get(url)
-        logging.info(f"\U0001F310 Opened MLH page: {url}")
-        
-        WebDriverWait(driver, 15).until(
-            EC.presence_of_all_elements_located((By.CLASS_NAME, "container.feature"))
-        )
-        feature_containers = driver.find_elements(By.CLASS_NAME, "container.feature")
-        hackathons_list = []
-    
-        for container in feature_containers:
-            try:
-                row = container.find_element(By.CLASS_NAME, "row")
-                event_wrappers = row.find_elements(By.CLASS_NAME, "event-wrapper")
-                if event_wrappers:
-                    logging.info(f"✅ Found {len(event_wrappers)} upcoming events.")
-                    for event in event_wrappers:
+def build_event(name, date_text, location, website, mode):
+    """Builds an MLH hackathon document from the raw listing fields (shared by both backends)."""
+    if mode == "Digital Only":
+        mode = "Online"
+        location = "Everywhere"
+    else:
+        mode = "Offline"
+    start_date, end_date = parse_mlh_date(date_text)
+    return normalize_dates({
+        "name": name,
+        "start_date": start_date,
+        "end_date": end_date,
+        "location": location,
+        "apply_link": website,
+        "mode": mode,
+        "source": "MLH"
+    })
+
+class MLHEventParser(HTMLParser):
+    """
+    Collects the event cards of the server-rendered MLH season page, grouped by
+    `container feature` section (the first non-empty section holds upcoming events).
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.sections = []
+        self._stack = []      # (tag, classes) of the open elements
+        self._event = None
+        self._event_depth = None
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        classes = set((attrs.get("class") or "").split())
+        if tag not in VOID_TAGS:
+            self._stack.append((tag, classes))
+
+        if {"container", "feature"} <= classes:
+            self.sections.append([])
+        elif "event-wrapper" in classes and self.sections:
+            self._event = {field: "" for field in MLH_FIELD_CLASSES}
+            self._event["href"] = None
+            self._event_depth = len(self._stack)
+        elif tag == "a" and self._event is not None and self._event["href"] is None:
+            self._event["href"] = attrs.get("href")
+
+    def handle_endtag(self, tag):
+        if tag in VOID_TAGS:
+            return
+        while self._stack:
+            open_tag, _ = self._stack.pop()
+            if self._event is not None and len(self._stack) < self._event_depth:
+                self.sections[-1].append(self._event)
+                self._event, self._event_depth = None, None
+            if open_tag == tag:
+                break
+
+    def handle_data(self, data):
+        if self._event is None:
+            return
+        for _, classes in reversed(self._stack):
+            field = next((c for c in MLH_FIELD_CLASSES if c in classes), None)
+            if field:
+                self._event[field] += data
+                break
+
+def extract_events_dom(driver):
+    """Per-element fallback for MLH_EXTRACT_JS (several WebDriver calls per event)."""
+    events = []
+    for container in driver.find_elements(By.CLASS_NAME, "container.feature"):
+        try:
+            row = container.find_element(By.CLASS_NAME, "row")
+            event_wrappers = row.find_elements(By.CLASS_NAME, "event-wrapper")
+            if event_wrappers:
+                for event in event_wrappers:
+                    try:
                         try:
-                            name = event.find_element(By.CLASS_NAME, "event-name").text.strip()
-                            date_text = event.find_element(By.CLASS_NAME, "event-date").text.strip()
-                            location = event.find_element(By.CLASS_NAME, "event-location").text.strip()
-                            website = event.find_element(By.TAG_NAME, "a").get_attribute("href")
-                            try:
-                                mode = event.find_element(By.CLASS_NAME, "event-hybrid-notes").text.strip()
-                            except:
-                                mode = "Unknown"
-                            if mode == "Digital Only":
-                                mode = "Online"
-                                location = "Everywhere"
-                            else:
-                                mode = "Offline"
-                            start_date, end_date = parse_mlh_date(date_text)
-                            event_data = {
-                                "name": name,
-                                "start_date": start_date,
-                                "end_date": end_date,
-                                "location": location,
-                                "apply_link": website,
-                                "mode": mode,
-                                "source": "MLH"
-                            }
-                            hackathons_list.append(event_data)
-                            logging.info(f"✔️ Event data extracted: {name}")
-                        except Exception:
-                            logging.error(f"❌ Error extracting event data: {traceback.format_exc()}")
-                    break
-            except Exception:
-                logging.warning(f"⚠️ Skipping container due to missing elements: {traceback.format_exc()}")
-    
-        if hackathons_list:
-            for event in hackathons_list:
-                if event["start_date"] and event["end_date"] and not collection.find_one({"name": event["name"], "start_date": event["start_date"]}):
-                    collection.insert_one(event)
-            logging.info(f"✅ Inserted {len(hackathons_list)} events into MongoDB.")
-        else:
-            logging.warning("⚠️ No new events found to insert.")
-    
-    except Exception:
-        logging.error(f"❌ An error occurred: {traceback.format_exc()}")
-    
-    finally:
-        driver.quit()
-        logging.info("🚪 WebDriver closed.")
+                            mode = event.find_element(By.CLASS_NAME, "event-hybrid-notes").text.strip()
+                        except:
+                            mode = "Unknown"
+                        events.append({
+                            "name": event.find_element(By.CLASS_NAME, "event-name").text.strip(),
+                            "date_text": event.find_element(By.CLASS_NAME, "event-date").text.strip(),
+                            "location": event.find_element(By.CLASS_NAME, "event-location").text.strip(),
+                            "website": event.find_element(By.TAG_NAME, "a").get_attribute("href"),
+                            "mode": mode,
+                        })
+                    except Exception:
+                        logging.error(f"❌ Error extracting event data: {traceback.format_exc()}")
+                break
+        except Exception:
+            logging.warning(f"⚠️ Skipping container due to missing elements: {traceback.format_exc()}")
+    return events
+
+@register_source
+class MLHSource(Source):
+    """MLH: the server-rendered season page, or the same page in undetected ChromeDriver."""
+
+    name = "MLH"
+    required_fields = ("name", "date_text", "location")
+    stop_at_known = False       # a single page, made conditional instead (ETag / Last-Modified)
+
+    def pages(self, session, state):
+        """The season page; on incremental runs the request is conditional and raises NotModified on a 304."""
+        incremental = state is not None and state.incremental
+        page_html, etag, last_modified = fetch_html_conditional(
+            session, MLH_URL,
+            etag=state.etag if incremental else None,
+            last_modified=state.last_modified if incremental else None,
+        )
+        if page_html is None:
+            raise NotModified(MLH_URL)
+        if state is not None:
+            state.etag, state.last_modified = etag, last_modified
+        yield page_html
+
+    def parse(self, page_html, base_url=MLH_URL):
+        """The upcoming events (first non-empty `container feature` section) of a season page."""
+        parser = MLHEventParser()
+        parser.feed(page_html)
+        parser.close()
+
+        events = next((section for section in parser.sections if section), [])
+        return [{
+            "name": " ".join(event["event-name"].split()),
+            "date_text": " ".join(event["event-date"].split()),
+            "location": " ".join(event["event-location"].split()),
+            "website": urljoin(base_url, event["href"]) if event["href"] else None,
+            "mode": " ".join(event["event-hybrid-notes"].split()) or "Unknown",
+        } for event in events]
+
+    def browser_pages(self, state):
+        with browser_session(undetected=True) as driver:
+            with stage("page_load"):
+                driver.get(MLH_URL)
+                logging.info(f"\U0001F310 Opened MLH page: {MLH_URL}")
+
+                WebDriverWait(driver, 15).until(
+                    EC.presence_of_all_elements_located((By.CLASS_NAME, "container.feature"))
+                )
+            events = extract_cards(driver, MLH_EXTRACT_JS, extract_events_dom)
+        logging.info(f"✅ Found {len(events)} upcoming events.")
+        yield events
+
+    def normalize(self, event):
+        """Builds the event document; events without dates are dropped."""
+        hackathon = build_event(event["name"], event["date_text"], event["location"], event["website"], event["mode"])
+        return hackathon if hackathon["start_date"] and hackathon["end_date"] else None
+
+def parse_mlh_html(page_html, base_url=MLH_URL):
+    """Parses the dated upcoming events out of an MLH season page (parse and normalize stages)."""
+    source = MLHSource()
+    return normalize_records(source, source.parse(page_html, base_url))
+
+def collect_mlh_hackathons(db):
+    """
+    Scrapes MLH (HTTP first, Selenium as fallback). Returns (events, state); events is
+    None when the season page has not changed since the last run (HTTP 304).
+    """
+    return collect(MLHSource(), db)
+
+def run_mlh_scraper():
+    """Scrapes the MLH season page and stores the events in MongoDB. Returns the number stored."""
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    return scrape_and_store(MLHSource(), get_mongo_client())
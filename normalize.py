@@ -0,0 +1,205 @@
+"""
+Shared normalization of the raw date and prize strings the scrapers collect.
+
+Patterns are compiled once, month names go through a lookup table instead of
+`strptime`, and every parser is memoized, since the same strings repeat across
+cards and runs. The batch helpers normalize a whole list at once, parsing each
+distinct string only once.
+"""
+import re
+from datetime import date, timedelta
+from functools import lru_cache
+
+MONTHS = {
+    "jan": 1, "january": 1, "feb": 2, "february": 2, "mar": 3, "march": 3,
+    "apr": 4, "april": 4, "may": 5, "jun": 6, "june": 6, "jul": 7, "july": 7,
+    "aug": 8, "august": 8, "sep": 9, "sept": 9, "september": 9, "oct": 10, "october": 10,
+    "nov": 11, "november": 11, "dec": 12, "december": 12,
+}
+
+_MONTH = r"([A-Za-z]{3,9})\.?"
+
+# Devpost submission periods
+_SAME_YEAR_RANGE = re.compile(rf"{_MONTH} (\d{{1,2}}) - {_MONTH} (\d{{1,2}}), (\d{{4}})")       # Jan 31 - Mar 02, 2025
+_SAME_MONTH_RANGE = re.compile(rf"{_MONTH} (\d{{1,2}}) - (\d{{1,2}}), (\d{{4}})")               # Feb 01 - 26, 2025
+_FULL_RANGE = re.compile(rf"{_MONTH} (\d{{1,2}}), (\d{{4}}) - {_MONTH} (\d{{1,2}}), (\d{{4}})")  # Dec 18, 2024 - Mar 02, 2025
+_SINGLE_DATE = re.compile(rf"{_MONTH} (\d{{1,2}}), (\d{{4}})")                                  # Mar 02, 2025
+
+# MLH event dates: "Jan 10th - 12th", "Dec 30th - Jan 2nd"
+_ORDINAL = re.compile(r"(\d)(st|nd|rd|th)\b", re.IGNORECASE)
+_MLH_RANGE = re.compile(r"([A-Za-z]+) (\d{1,2})\s*-\s*(?:([A-Za-z]+) )?(\d{1,2})")
+
+# Devfolio start dates: "STARTS 01/03/25"
+_DAY_MONTH_YEAR = re.compile(r"(\d{1,2})/(\d{1,2})/(\d{2,4})")
+
+# Prize amounts: "$10,000", "$5K", "Between $5K and $10K"
+_AMOUNT = re.compile(r"(\d+(?:\.\d+)?)([km]?)")
+_MULTIPLIERS = {"": 1, "k": 1000, "m": 1_000_000}
+
+CACHE_SIZE = 4096
+
+# MLH events that started up to this many days ago still belong to the current year (running or just ended)
+MLH_GRACE_DAYS = 14
+
+
+def month_number(name):
+    """Month number for a month name or abbreviation (case-insensitive), or None."""
+    if not name:
+        return None
+    name = name.lower()
+    return MONTHS.get(name) or MONTHS.get(name[:3])
+
+
+def _date(year, month_name, day):
+    month = month_number(month_name)
+    if month is None:
+        return None
+    try:
+        return date(int(year), month, int(day))
+    except ValueError:
+        return None
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def parse_date_range(text):
+    """
+    Parses a Devpost submission period into (start, end) dates, or (None, None).
+    A range whose end month precedes its start month ("Dec 18 - Jan 05, 2025")
+    starts in the previous year.
+    """
+    if not text or "Not available" in text:
+        return None, None
+
+    match = _SAME_YEAR_RANGE.match(text)
+    if match:
+        start_month, start_day, end_month, end_day, year = match.groups()
+        end = _date(year, end_month, end_day)
+        start = _date(year, start_month, start_day)
+        if start and end and start > end:
+            start = _date(int(year) - 1, start_month, start_day)
+        return start, end
+
+    match = _SAME_MONTH_RANGE.match(text)
+    if match:
+        month, start_day, end_day, year = match.groups()
+        return _date(year, month, start_day), _date(year, month, end_day)
+
+    match = _FULL_RANGE.match(text)
+    if match:
+        start_month, start_day, start_year, end_month, end_day, end_year = match.groups()
+        return _date(start_year, start_month, start_day), _date(end_year, end_month, end_day)
+
+    match = _SINGLE_DATE.match(text)
+    if match:
+        month, day, year = match.groups()
+        single = _date(year, month, day)
+        return single, single
+
+    return None, None
+
+
+def _upcoming_date(month, day, today):
+    """
+    The first (month, day) on or after `today` minus MLH_GRACE_DAYS: the season page
+    lists upcoming events, so a date further in the past belongs to the next year.
+    """
+    earliest = today - timedelta(days=MLH_GRACE_DAYS)
+    for year in range(earliest.year, earliest.year + 5):   # Feb 29 may be up to 4 years out
+        try:
+            candidate = date(year, month, day)
+        except ValueError:
+            continue
+        if candidate >= earliest:
+            return candidate
+    return None
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _parse_mlh_date(text, today):
+    match = _MLH_RANGE.match(_ORDINAL.sub(r"\1", text.strip()))
+    if not match:
+        return None, None
+    start_month_name, start_day, end_month_name, end_day = match.groups()
+
+    start_month = month_number(start_month_name)
+    end_month = month_number(end_month_name) if end_month_name else start_month
+    if start_month is None or end_month is None:
+        return None, None
+
+    start = _upcoming_date(start_month, int(start_day), today)
+    if start is None:
+        return None, None
+    # An event that ends in an earlier month than it starts crosses into the next year
+    end_year = start.year + 1 if end_month < start_month else start.year
+    try:
+        end = date(end_year, end_month, int(end_day))
+    except ValueError:
+        return None, None
+    return start, end
+
+
+def parse_mlh_date(text, today=None):
+    """
+    Parses an MLH event date ("Jan 10th - 12th", "Dec 30th - Jan 2nd") into
+    (start, end) dates, or (None, None). The season page lists upcoming events
+    without years, so the start is the first such date on or after `today`
+    (less MLH_GRACE_DAYS for running events), and the end rolls into the next
+    year when the range crosses New Year.
+    """
+    if not text:
+        return None, None
+    return _parse_mlh_date(text, today or date.today())
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def parse_day_month_year(text):
+    """Parses a DD/MM/YY(YY) date (e.g. Devfolio's "STARTS 01/03/25"), or None."""
+    match = _DAY_MONTH_YEAR.search(text or "")
+    if not match:
+        return None
+    day, month, year = (int(part) for part in match.groups())
+    if year < 100:
+        year += 2000
+    try:
+        return date(year, month, day)
+    except ValueError:
+        return None
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def parse_prize(text):
+    """
+    Parses a prize label into an integer amount, taking the highest amount of a
+    range ("Between $5K and $10K" -> 10000). Returns 0 when no amount is found.
+    """
+    if not text:
+        return 0
+    cleaned = text.lower().replace(",", "").replace("usd", "")
+    amounts = [int(float(number) * _MULTIPLIERS[suffix]) for number, suffix in _AMOUNT.findall(cleaned)]
+    return max(amounts) if amounts else 0
+
+
+def _batch(parser, texts, *args):
+    """Applies `parser` to each distinct string once and maps the results back onto `texts`."""
+    results = {text: parser(text, *args) for text in set(texts)}
+    return [results[text] for text in texts]
+
+
+def normalize_date_ranges(texts):
+    """Batch form of `parse_date_range`."""
+    return _batch(parse_date_range, texts)
+
+
+def normalize_mlh_dates(texts, today=None):
+    """Batch form of `parse_mlh_date`."""
+    return _batch(parse_mlh_date, texts, today or date.today())
+
+
+def normalize_prizes(texts):
+    """Batch form of `parse_prize`."""
+    return _batch(parse_prize, texts)
+
+
+def iso(value):
+    """ISO string of a date, or None."""
+    return value.isoformat() if value else None
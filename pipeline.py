@@ -0,0 +1,326 @@
+"""
+Source plugins and the scraping pipeline they share.
+
+A source (one per site, registered with @register_source) only knows its
+site: how to fetch the listing pages over HTTP (and, as a fallback, in a
+browser), how to parse a page into raw records and how to normalize a record
+into a hackathon document. Pipeline runs every source through the same stages
+
+    fetch → parse → normalize → geocode → dedupe → write
+
+connected by bounded queues with one thread per stage, so page N is parsed
+and normalized while page N+1 is still being fetched. Each stage is timed in
+the source's scrape report profile. The sink is the write stage; Collector
+keeps the documents for the cross-source merge (scraper_utils.persist_merged),
+which needs every document of a run before anything is written.
+
+Adding a source: subclass Source in a new module, decorate it with
+@register_source and list the module in SOURCE_MODULES.
+"""
+import importlib
+import logging
+import os
+import queue
+import threading
+
+import geo
+from http_utils import get_session
+from scrape_report import bind, current, stage
+from scraper_utils import (NotModified, ScrapeState, get_scraper_backend, hackathon_key, mark_scrape_complete,
+                           persist_merged)
+from snapshots import publish_snapshots
+
+# Modules of the built-in sources, imported (and so registered) on demand in this order
+SOURCE_MODULES = ("devpost_scraper", "mlh_scraper", "devfolio_scraper")
+
+# Pages buffered between two stages (SCRAPER_PIPELINE_QUEUE; 0 runs the stages inline in one thread)
+DEFAULT_QUEUE_SIZE = 2
+
+_registry = {}
+_DONE = object()
+
+
+def register_source(cls):
+    """Class decorator registering a Source subclass under its `name`."""
+    _registry[cls.name] = cls
+    return cls
+
+
+def load_sources():
+    """Imports the built-in source modules and returns {name: Source instance} in registration order."""
+    for module in SOURCE_MODULES:
+        importlib.import_module(module)
+    return {name: cls() for name, cls in _registry.items()}
+
+
+class Source:
+    """
+    A scraper plugin. Subclasses set `name` and implement `pages`, `parse` and
+    `normalize`; sources with a browser fallback also implement `browser_pages`.
+    Importing a source module must not open connections or browsers.
+    """
+
+    name = None
+    limit = None                # keep at most this many hackathons per run (None: all)
+    required_fields = ()        # browser cards missing one of these are skipped
+    stop_at_known = True        # incremental runs stop paging at a page of already-known hackathons
+
+    def pages(self, session, state):
+        """Yields the raw listing pages (API payloads, HTML) fetched over HTTP; raises NotModified on a 304."""
+        raise NotImplementedError
+
+    def parse(self, page):
+        """Returns the raw records (dicts of listing fields) of one page from `pages`."""
+        raise NotImplementedError
+
+    def browser_pages(self, state):
+        """Yields lists of raw cards scraped in a browser (fallback backend)."""
+        raise NotImplementedError(f"{self.name} has no browser backend")
+
+    def parse_cards(self, cards):
+        """Returns the raw records of one batch of browser cards (by default: those with every required field)."""
+        records = []
+        for card in cards:
+            missing = [field for field in self.required_fields if card.get(field) is None]
+            if missing:
+                logging.error(f"❌ {self.name}: skipping one card with missing fields: {', '.join(missing)}")
+                continue
+            records.append(card)
+        return records
+
+    def normalize(self, record):
+        """Builds the hackathon document of one raw record, or returns None to drop it."""
+        raise NotImplementedError
+
+
+def normalize_records(source, records):
+    """Normalizes raw records into hackathon documents, skipping (and logging) the ones that fail."""
+    hackathons = []
+    for record in records:
+        try:
+            hackathon = source.normalize(record)
+        except Exception as e:
+            logging.error(f"❌ {source.name}: skipping one event due to error: {e}")
+            continue
+        if hackathon is not None:
+            hackathons.append(hackathon)
+    return hackathons
+
+
+class Collector:
+    """Sink keeping every document in memory; `close` returns them."""
+
+    def __init__(self):
+        self.hackathons = []
+
+    def write(self, hackathons):
+        self.hackathons.extend(hackathons)
+
+    def close(self):
+        return self.hackathons
+
+
+class Pipeline:
+    """
+    Runs one source through fetch → parse → normalize → geocode → dedupe → write.
+
+    Fetching happens in the calling thread, the other stages each in a worker
+    thread, handing batches (one per page) over bounded queues. Fetching stops
+    once dedupe reaches a page of already-known, unchanged hackathons
+    (incremental runs) or the source's limit; the stages run concurrently,
+    so up to `queue_size` extra pages may already be in flight by then.
+    """
+
+    STEPS = ("parse", "normalize", "geocode", "dedupe", "write")
+
+    def __init__(self, source, state, sink, profile=None, queue_size=None):
+        self.source = source
+        self.state = state
+        self.sink = sink
+        self.profile = profile or current()
+        self.queue_size = queue_size if queue_size is not None else int(
+            os.getenv("SCRAPER_PIPELINE_QUEUE", DEFAULT_QUEUE_SIZE))
+        self.normalized = 0
+        self.not_modified = False
+        self._seen = set()
+        self._stop = threading.Event()
+        self._queues = []
+        self._error = None
+
+    def run(self, threaded=True):
+        """
+        Scrapes the source into the sink and returns `sink.close()`, or None when
+        the source reported that nothing changed since the last run.
+        With `threaded=False` (or a queue size of 0) every stage runs in the
+        calling thread, page by page, e.g. so a profiler sees all of them.
+        """
+        steps = [(name, getattr(self, name)) for name in self.STEPS]
+        if threaded and self.queue_size > 0:
+            self._run_threaded(steps)
+        else:
+            for batch in self.fetch():
+                for name, step in steps:
+                    with stage(name, self.profile):
+                        batch = step(batch)
+        return None if self.not_modified else self.sink.close()
+
+    # Stages
+    def fetch(self):
+        """
+        Yields (parser, page) pairs: HTTP pages first, browser cards when HTTP
+        fails or yields nothing (or when SCRAPER_BACKEND=selenium).
+        """
+        name = self.source.name
+        if get_scraper_backend() == "http":
+            try:
+                for page in self._until_stopped(self.source.pages(get_session(), self.state)):
+                    yield self.source.parse, page
+                self._drain()
+                if self._error is not None:
+                    return
+                if self.normalized:
+                    logging.info(f"✅ {name}: fetched {self.normalized} hackathons over HTTP.")
+                    return
+                logging.warning(f"⚠️ {name}: HTTP backend returned nothing, falling back to Selenium.")
+            except NotModified:
+                logging.info(f"✅ {name}: not modified since the last run.")
+                self.not_modified = True
+                return
+            except Exception as e:
+                logging.warning(f"⚠️ {name}: HTTP backend failed ({e}), falling back to Selenium.")
+        for cards in self._until_stopped(self.source.browser_pages(self.state)):
+            yield self.source.parse_cards, cards
+
+    def parse(self, page):
+        parser, payload = page
+        return parser(payload)
+
+    def normalize(self, records):
+        hackathons = normalize_records(self.source, records)
+        self.normalized += len(hackathons)
+        return hackathons
+
+    def geocode(self, hackathons):
+        """Resolves free-text locations to city, country and coordinates (see geo.py)."""
+        return [geo.geocode(hackathon) for hackathon in hackathons]
+
+    def dedupe(self, hackathons):
+        """
+        Stops at a page of already-known, unchanged hackathons, drops hackathons already
+        seen in this run (pages and backends can overlap) and applies the limit.
+        """
+        self._stop_at_known(hackathons)
+        fresh = []
+        for hackathon in hackathons:
+            key = hackathon_key(dict(hackathon, source=self.source.name))
+            if key in self._seen:
+                continue
+            if self.source.limit is not None and len(self._seen) >= self.source.limit:
+                self._stop.set()
+                break
+            self._seen.add(key)
+            fresh.append(hackathon)
+        return fresh
+
+    def write(self, hackathons):
+        if hackathons:
+            self.sink.write(hackathons)
+
+    # Plumbing
+    def _stop_at_known(self, hackathons):
+        """Incremental runs stop paging here: after geocoding, as ScrapeState.save hashes geocoded documents."""
+        if (self.source.stop_at_known and self.state is not None and not self._stop.is_set()
+                and self.state.knows_all(hackathons, content=True)):
+            self.state.stop_early("reached a page of already-known, unchanged hackathons")
+            self._stop.set()
+
+    def _until_stopped(self, pages):
+        """Pulls pages (timed as the "fetch" stage) until a later stage asks to stop."""
+        try:
+            while not self._stop.is_set():
+                with stage("fetch", self.profile):
+                    page = next(pages, _DONE)
+                if page is _DONE:
+                    return
+                yield page
+        finally:
+            pages.close()
+
+    def _drain(self):
+        """Waits until every page handed over so far went through all stages (no-op when inline)."""
+        for inbox in self._queues:
+            inbox.join()
+
+    def _run_threaded(self, steps):
+        self._queues = [queue.Queue(self.queue_size) for _ in steps]
+        workers = [threading.Thread(target=self._work, args=(index, name, step), name=self.source.name, daemon=True)
+                   for index, (name, step) in enumerate(steps)]
+        for worker in workers:
+            worker.start()
+        try:
+            for batch in self.fetch():
+                if self._error is not None:
+                    break
+                self._queues[0].put(batch)
+        finally:
+            self._queues[0].put(_DONE)
+            for worker in workers:
+                worker.join()
+        if self._error is not None:
+            raise self._error
+
+    def _work(self, index, name, step):
+        """
+        Worker loop of one stage. After any stage failed it keeps draining its inbox, so
+        upstream never blocks, and the first error is re-raised by `run`.
+        """
+        bind(self.profile)
+        inbox = self._queues[index]
+        outbox = self._queues[index + 1] if index + 1 < len(self._queues) else None
+        while True:
+            batch = inbox.get()
+            try:
+                if batch is not _DONE:
+                    batch = self._apply(name, step, batch) if self._error is None else None
+                if outbox is not None and batch is not None:
+                    outbox.put(batch)
+            finally:
+                inbox.task_done()
+            if batch is _DONE:
+                return
+
+    def _apply(self, name, step, batch):
+        try:
+            with stage(name, self.profile):
+                return step(batch)
+        except Exception as e:
+            self._error = self._error or e
+            self._stop.set()
+            return None
+
+
+def collect(source, db, threaded=True):
+    """Scrapes `source` without writing. Returns (hackathons, state); hackathons is None when not modified."""
+    state = ScrapeState.load(db, source.name)
+    return Pipeline(source, state, Collector()).run(threaded), state
+
+
+def scrape_and_store(source, db):
+    """
+    Scrapes `source` alone and stores it as run_all_scrapers.py would: merged with
+    the stored rows of every other source (see scraper_utils.persist_merged), then
+    republishes the snapshots and bumps the scrape generation so the APIs pick up
+    the new rows. Returns the number of hackathons scraped.
+    """
+    hackathons, state = collect(source, db)
+    if hackathons is None:
+        return 0
+    if not hackathons:
+        logging.warning(f"⚠️ {source.name}: no hackathons extracted.")
+        return 0
+    summary = {"source": source.name, "ok": True, "hackathons": hackathons, "state": state, "profile": None}
+    persist_merged(db, [summary], sources=list(load_sources()))
+    with stage("publish_snapshots"):
+        publish_snapshots(db)
+    mark_scrape_complete(db)
+    return len(hackathons)
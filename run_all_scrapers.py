@@ -1,8 +1,126 @@
-from devpost_scraper import run_devpost_scraper
-from mlh_scraper import run_mlh_scraper
-from devfolio_scraper import run_devfolio_scraper
+import argparse
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from pipeline import collect, load_sources
+from scraper_utils import DRIVER_POOL, get_mongo_client, mark_scrape_complete, persist_merged, prepare_database
+from snapshots import publish_snapshots
+import scrape_report
+
+# Every registered source plugin; each is collected (without writing) through the shared pipeline
+SCRAPERS = load_sources()
+
+# Fewer browsers than sources, so the last source to start takes a warm browser instead of launching Chrome
+DEFAULT_BROWSERS = max(1, min(2, len(SCRAPERS) - 1))
+
+
+class ErrorCounter(logging.Handler):
+    """Counts ERROR-level log records per scraper thread (threads are named after their source)."""
+
+    def __init__(self):
+        super().__init__(level=logging.ERROR)
+        self.counts = {}
+        self._lock = threading.Lock()
+
+    def emit(self, record):
+        with self._lock:
+            self.counts[record.threadName] = self.counts.get(record.threadName, 0) + 1
+
+
+def run_source(db, source, scraper, profile_dir=None, profiler="cprofile"):
+    """
+    Runs one source's pipeline from the current worker thread; failures are contained
+    and reported. Its stage timings are collected in the summary's "profile". When
+    profiling, the pipeline stages run inline so the profiler sees all of them.
+    """
+    threading.current_thread().name = source
+    started = time.monotonic()
+    summary = {"source": source, "items": 0, "ok": True, "error": None, "hackathons": None, "state": None,
+               "profile": scrape_report.begin(source)}
+    try:
+        with scrape_report.profiled(profile_dir, source, profiler):
+            summary["hackathons"], summary["state"] = collect(scraper, db, threaded=not profile_dir)
+        summary["items"] = len(summary["hackathons"] or [])
+    except Exception as e:
+        logging.exception(f"❌ {source} scraper failed")
+        summary["ok"] = False
+        summary["error"] = str(e)
+    finally:
+        scrape_report.end()
+    summary["duration"] = time.monotonic() - started
+    return summary
+
+
+def run_all(db, browsers, profile_dir=None, profiler="cprofile"):
+    """
+    Runs every scraper concurrently with at most `browsers` Chrome instances alive
+    at once, and returns one summary per source. Browsers stay warm between
+    sources (a new tab each) until every scraper is done.
+    """
+    errors = ErrorCounter()
+    logging.getLogger().addHandler(errors)
+    DRIVER_POOL.enabled = True
+    try:
+        with ThreadPoolExecutor(max_workers=browsers, thread_name_prefix="scraper") as pool:
+            futures = [pool.submit(run_source, db, source, scraper, profile_dir, profiler)
+                       for source, scraper in SCRAPERS.items()]
+            summaries = [future.result() for future in futures]
+    finally:
+        DRIVER_POOL.close()
+        logging.getLogger().removeHandler(errors)
+
+    for summary in summaries:
+        summary["errors"] = errors.counts.get(summary["source"], 0)
+    return summaries
+
+
+def log_summary(summaries, elapsed):
+    logging.info("📊 Scrape summary:")
+    for s in summaries:
+        status = "✅" if s["ok"] else "❌"
+        logging.info(f"  {status} {s['source']:<9} {s['duration']:7.1f}s  {s['items']:4d} items  {s['errors']} errors"
+                     + (f"  ({s['error']})" if s["error"] else ""))
+    logging.info(f"⏱️ Total wall-clock time: {elapsed:.1f}s")
+
 
 if __name__ == "__main__":
-    run_devpost_scraper()
-    run_mlh_scraper()
-    run_devfolio_scraper()
+    parser = argparse.ArgumentParser(description="Run all hackathon scrapers concurrently.")
+    parser.add_argument("--browsers", type=int, default=int(os.getenv("SCRAPER_BROWSER_POOL", DEFAULT_BROWSERS)),
+                        help=f"maximum number of sources (and browsers) running at once (default: {DEFAULT_BROWSERS})")
+    parser.add_argument("--report", default=os.getenv("SCRAPER_REPORT"),
+                        help="write a JSON run report with per-stage timings to this path")
+    parser.add_argument("--profile", metavar="DIR", default=os.getenv("SCRAPER_PROFILE_DIR"),
+                        help="dump a profile of each source (and of the merge/write phase) into DIR")
+    parser.add_argument("--profiler", choices=scrape_report.PROFILERS, default="cprofile",
+                        help="profiler used by --profile (default: cprofile)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(threadName)s - %(levelname)s - %(message)s", force=True)
+
+    db = get_mongo_client()
+    run = scrape_report.begin("run")
+
+    started = time.monotonic()
+    with scrape_report.stage("prepare_database"):
+        prepare_database(db)
+
+    summaries = run_all(db, max(1, args.browsers), args.profile, args.profiler)
+
+    # merging and writing happen on the main thread, after the per-source profiles are closed
+    with scrape_report.profiled(args.profile, "persist", args.profiler):
+        persist_merged(db, summaries, sources=list(SCRAPERS))
+        if any(s["ok"] and s["items"] for s in summaries):
+            with scrape_report.stage("publish_snapshots"):
+                publish_snapshots(db)
+            mark_scrape_complete(db)
+    elapsed = time.monotonic() - started
+    log_summary(summaries, elapsed)
+
+    if args.report:
+        scrape_report.write_report(args.report, scrape_report.build_report(summaries, run, elapsed))
+        logging.info(f"📝 Run report written to {args.report}")
+    if not any(s["ok"] for s in summaries):
+        raise SystemExit("❌ All scrapers failed.")
@@ -0,0 +1,192 @@
+"""
+Per-stage timing of scrape runs.
+
+Each source gets a SourceProfile bound to the thread that scrapes it. Code
+marks its stages with `stage(...)` (driver startup, page load, scroll,
+extraction, HTTP fetch, DB write), every WebDriver command is counted and
+timed by wrapping `driver.execute`, and polling sleeps go through `sleep()`.
+`run_all_scrapers.py --report` writes the collected profiles as JSON, and
+`--profile` additionally dumps a cProfile (or pyinstrument) profile per source.
+Outside a profiled run all of this is a cheap no-op.
+"""
+import json
+import logging
+import os
+import platform
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+_local = threading.local()
+
+PROFILERS = ("cprofile", "pyinstrument")
+
+
+class SourceProfile:
+    """Stage timings, WebDriver round trips, HTTP requests and sleep time of one source."""
+
+    def __init__(self, source):
+        self.source = source
+        self.stages = defaultdict(lambda: {"seconds": 0.0, "calls": 0})
+        self.webdriver = defaultdict(lambda: {"seconds": 0.0, "calls": 0})
+        self.sleep_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def add(self, stage, seconds):
+        with self._lock:
+            entry = self.stages[stage]
+            entry["seconds"] += seconds
+            entry["calls"] += 1
+
+    def add_webdriver(self, command, seconds):
+        with self._lock:
+            entry = self.webdriver[command]
+            entry["seconds"] += seconds
+            entry["calls"] += 1
+
+    def to_dict(self):
+        with self._lock:
+            return {
+                "stages": {name: {"seconds": round(entry["seconds"], 4), "calls": entry["calls"]}
+                           for name, entry in self.stages.items()},
+                "webdriver": {
+                    "round_trips": sum(entry["calls"] for entry in self.webdriver.values()),
+                    "seconds": round(sum(entry["seconds"] for entry in self.webdriver.values()), 4),
+                    "commands": {command: {"seconds": round(entry["seconds"], 4), "calls": entry["calls"]}
+                                 for command, entry in sorted(self.webdriver.items())},
+                },
+                "sleep_seconds": round(self.sleep_seconds, 4),
+            }
+
+
+def begin(source):
+    """Binds a new profile for `source` to the current thread and returns it."""
+    _local.profile = SourceProfile(source)
+    return _local.profile
+
+
+def bind(profile):
+    """Binds an existing profile to the current thread (worker threads of a source's pipeline)."""
+    _local.profile = profile
+
+
+def end():
+    _local.profile = None
+
+
+def current():
+    return getattr(_local, "profile", None)
+
+
+@contextmanager
+def stage(name, profile=None):
+    """Times the block as stage `name` of `profile` (default: the current thread's source)."""
+    profile = profile or current()
+    if profile is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        profile.add(name, time.perf_counter() - started)
+
+
+def sleep(seconds):
+    """time.sleep that is accounted as idle time of the current source."""
+    time.sleep(seconds)
+    profile = current()
+    if profile is not None:
+        profile.sleep_seconds += seconds
+
+
+def instrument_driver(driver):
+    """
+    Counts and times every WebDriver round trip (all commands go through `driver.execute`),
+    charged to the source of the calling thread, so a reused browser reports to its current user.
+    """
+    execute = driver.execute
+
+    def timed_execute(driver_command, params=None):
+        profile = current()
+        if profile is None:
+            return execute(driver_command, params)
+        started = time.perf_counter()
+        try:
+            return execute(driver_command, params)
+        finally:
+            profile.add_webdriver(driver_command, time.perf_counter() - started)
+
+    driver.execute = timed_execute
+    return driver
+
+
+@contextmanager
+def profiled(directory, name, profiler="cprofile"):
+    """
+    Profiles the block with cProfile (`<name>.prof`, open with snakeviz or pstats)
+    or pyinstrument (`<name>.html`) into `directory`; a no-op when `directory` is None.
+    Profilers only see the thread they were started in, so each source gets its own;
+    on Python 3.12+ only one cProfile can run at a time, so use --browsers 1 or
+    pyinstrument to profile every source of a concurrent run.
+    """
+    if not directory:
+        yield
+        return
+    os.makedirs(directory, exist_ok=True)
+
+    if profiler == "pyinstrument":
+        from pyinstrument import Profiler
+        instrument = Profiler()
+        instrument.start()
+        try:
+            yield
+        finally:
+            instrument.stop()
+            with open(os.path.join(directory, f"{name}.html"), "w") as out:
+                out.write(instrument.output_html())
+        return
+
+    import cProfile
+    profile = cProfile.Profile()
+    try:
+        profile.enable()
+    except ValueError as e:  # Python 3.12+ allows a single active cProfile per process
+        logging.warning(f"⚠️ Not profiling {name}: {e}")
+        yield
+        return
+    try:
+        yield
+    finally:
+        profile.disable()
+        profile.dump_stats(os.path.join(directory, f"{name}.prof"))
+
+
+def build_report(summaries, stages, elapsed):
+    """Machine-readable run report: per-source outcome and stages plus run-level stages."""
+    return {
+        "finished_at": datetime.now(timezone.utc).isoformat(),
+        "total_seconds": round(elapsed, 3),
+        "python": platform.python_version(),
+        "backend": os.getenv("SCRAPER_BACKEND", "http"),
+        "extraction": os.getenv("SCRAPER_EXTRACTION", "js"),
+        "stages": stages.to_dict()["stages"],
+        "sources": {
+            s["source"]: {
+                "ok": s["ok"],
+                "error": s["error"],
+                "items": s["items"],
+                "errors": s.get("errors", 0),
+                "duration": round(s["duration"], 3),
+                **(s["profile"].to_dict() if s.get("profile") else {}),
+            }
+            for s in summaries
+        },
+    }
+
+
+def write_report(path, report):
+    with open(path, "w") as out:
+        json.dump(report, out, indent=2)
@@ -0,0 +1,138 @@
+import re
+import threading
+import unicodedata
+from collections import defaultdict
+
+# Relative weight of a match in each indexed field
+FIELD_WEIGHTS = {"name": 3.0, "location": 1.0, "source": 0.5}
+
+# Score multipliers per kind of term match
+EXACT, PREFIX, SUBSTRING, FUZZY = 1.0, 0.9, 0.7, 0.6
+
+# Minimum trigram similarity for a typo-tolerant match
+FUZZY_THRESHOLD = 0.4
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text):
+    """Lowercases, strips accents and splits `text` (or a list of strings) into alphanumeric tokens."""
+    if isinstance(text, (list, tuple)):
+        text = " ".join(item for item in text if isinstance(item, str))
+    if not isinstance(text, str):
+        return []
+    text = unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode()
+    return _TOKEN_RE.findall(text.lower())
+
+
+def trigrams(token):
+    """Padded character trigrams, so short tokens and prefixes still share grams."""
+    padded = f"  {token} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class SearchIndex:
+    """
+    In-memory inverted index over hackathon `name`, `location` and `source`.
+
+    Query tokens are resolved against the vocabulary through a trigram index
+    (exact, prefix, substring or fuzzy match), then the postings of the matched
+    terms are scored per document. Every query token must match for a document
+    to be returned. Search cost depends on the vocabulary touched by the query,
+    not on the number of documents.
+    """
+
+    def __init__(self, docs):
+        self.docs = list(docs)
+        self._postings = defaultdict(dict)   # term -> {doc index: {field: weight}}
+        self._grams = defaultdict(set)       # trigram -> terms
+        self._term_grams = {}                # term -> trigrams
+
+        for position, doc in enumerate(self.docs):
+            for field, weight in FIELD_WEIGHTS.items():
+                # merged records list every source they were found on
+                value = doc.get("sources") if field == "source" and doc.get("sources") else doc.get(field)
+                for term in tokenize(value):
+                    fields = self._postings[term].setdefault(position, {})
+                    fields[field] = weight
+
+        for term in self._postings:
+            grams = trigrams(term)
+            self._term_grams[term] = grams
+            for gram in grams:
+                self._grams[gram].add(term)
+
+    def _match_terms(self, token):
+        """Returns {term: match score} for the vocabulary terms matching a query token."""
+        grams = trigrams(token)
+        candidates = set()
+        for gram in grams:
+            candidates |= self._grams.get(gram, set())
+
+        matches = {}
+        for term in candidates:
+            if term == token:
+                matches[term] = EXACT
+            elif term.startswith(token):
+                matches[term] = PREFIX
+            elif len(token) >= 3 and token in term:
+                matches[term] = SUBSTRING
+            else:
+                term_grams = self._term_grams[term]
+                similarity = len(grams & term_grams) / len(grams | term_grams)
+                if similarity >= FUZZY_THRESHOLD:
+                    matches[term] = FUZZY * similarity
+        return matches
+
+    def search(self, query, fields=None):
+        """
+        Returns the documents matching `query`, best match first.
+        `fields` restricts matching to a subset of FIELD_WEIGHTS.
+        """
+        tokens = tokenize(query)
+        if not tokens:
+            return list(self.docs)
+
+        allowed = set(fields or FIELD_WEIGHTS)
+        scores = None
+        for token in tokens:
+            token_scores = {}
+            for term, match in self._match_terms(token).items():
+                for position, field_weights in self._postings[term].items():
+                    weight = max((w for f, w in field_weights.items() if f in allowed), default=0)
+                    if weight and match * weight > token_scores.get(position, 0):
+                        token_scores[position] = match * weight
+
+            if scores is None:
+                scores = token_scores
+            else:
+                scores = {p: s + token_scores[p] for p, s in scores.items() if p in token_scores}
+            if not scores:
+                return []
+
+        ranked = sorted(scores, key=lambda p: (-scores[p], str(self.docs[p].get("start_date") or "")))
+        return [self.docs[p] for p in ranked]
+
+
+class LiveSearchIndex:
+    """Lazily (re)builds a SearchIndex from `load_docs` after every invalidation."""
+
+    def __init__(self, load_docs):
+        self.load_docs = load_docs
+        self._index = None
+        self._lock = threading.Lock()
+
+    def invalidate(self):
+        self._index = None
+
+    def get(self):
+        index = self._index
+        if index is None:
+            with self._lock:
+                if self._index is None:
+                    self._index = SearchIndex(self.load_docs())
+                index = self._index
+        return index
+
+    def search(self, query, fields=None):
+        return self.get().search(query, fields)
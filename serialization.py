@@ -0,0 +1,28 @@
+import json
+from datetime import date, datetime
+
+from bson import ObjectId
+
+# Bookkeeping fields written by the scrapers that are never returned by the API
+INTERNAL_FIELDS = ("_id", "key", "content_hash")
+
+
+def _json_default(value):
+    """Serializes the BSON types json.dumps does not know about."""
+    if isinstance(value, datetime):
+        return value.date().isoformat()
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, ObjectId):
+        return str(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(value):
+    """Compact JSON as served by the API (dates as YYYY-MM-DD)."""
+    return json.dumps(value, default=_json_default, separators=(",", ":"))
+
+
+def public_projection():
+    """MongoDB projection hiding INTERNAL_FIELDS."""
+    return {field: 0 for field in INTERNAL_FIELDS}
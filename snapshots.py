@@ -0,0 +1,228 @@
+"""
+Precomputed response snapshots.
+
+Between scrape runs the dataset is static, so the end of every run publishes
+the full hackathon list and its most requested slices (per mode, per source,
+upcoming only) as ready-to-send JSON bodies, pre-compressed with gzip (and
+brotli when available) and tagged with a strong ETag. The API loads them once
+per scrape generation and serves them without querying or re-serializing.
+Slices that depend on the date (upcoming) are only served on their publish
+date; after that the API answers them with a query.
+"""
+import gzip
+import hashlib
+import threading
+from datetime import datetime, timezone
+
+from bson import Binary
+
+from serialization import dumps, public_projection
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; snapshots are then served as gzip or identity
+    brotli = None
+
+SNAPSHOT_COLLECTION = "snapshots"
+
+# Facet values published as their own slice
+SNAPSHOT_MODES = ("Online", "Offline")
+SNAPSHOT_SOURCES = ("Devpost", "MLH", "Devfolio")
+
+# Slices computed against the publish date, served only until that day ends (UTC)
+DATED_SLICES = ("upcoming",)
+
+# Truthy spellings of `upcoming=`
+TRUE_VALUES = ("1", "true", "yes")
+
+# Content codings a snapshot may be served in, most preferred first
+SNAPSHOT_ENCODINGS = ("br", "gzip", "identity")
+
+GZIP_LEVEL = 9
+BROTLI_QUALITY = 11
+
+
+def _today():
+    now = datetime.now(timezone.utc)
+    return datetime(now.year, now.month, now.day)
+
+
+def _has_source(doc, source):
+    return doc.get("source") == source or source in (doc.get("sources") or [])
+
+
+def snapshot_slices(today=None):
+    """Returns {slice name: predicate over a stored document} for every published slice."""
+    today = today or _today()
+    slices = {"all": lambda doc: True}
+    for mode in SNAPSHOT_MODES:
+        slices[f"mode:{mode}"] = lambda doc, mode=mode: doc.get("mode") == mode
+    for source in SNAPSHOT_SOURCES:
+        slices[f"source:{source}"] = lambda doc, source=source: _has_source(doc, source)
+    slices["upcoming"] = lambda doc: isinstance(doc.get("start_date"), datetime) and doc["start_date"] >= today
+    return slices
+
+
+def snapshot_name(args):
+    """
+    Maps request args to the slice that answers them exactly, or None: no args
+    is "all", and a lone `mode=`, `source=` or truthy `upcoming=` picks its slice.
+    """
+    if not args:
+        return "all"
+    if len(args) != 1:
+        return None
+    name, value = next(iter(args.items()))
+    value = value.strip()
+    if name in ("mode", "source") and value:
+        return f"{name}:{value}"
+    if name == "upcoming" and value.lower() in TRUE_VALUES:
+        return "upcoming"
+    return None
+
+
+def negotiate_encoding(accept_encoding, available):
+    """
+    Picks the content coding for an Accept-Encoding header: the highest q-value
+    among `available`, ties broken by SNAPSHOT_ENCODINGS order. Identity is
+    acceptable unless the header refuses it.
+    """
+    qualities = {}
+    for item in (accept_encoding or "").split(","):
+        coding, _, params = item.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        name, _, value = params.strip().partition("=")
+        if name.strip() == "q":
+            try:
+                quality = float(value)
+            except ValueError:
+                quality = 0.0
+        qualities[coding] = quality
+
+    def quality_of(coding):
+        if coding in qualities:
+            return qualities[coding]
+        if coding == "identity":
+            return qualities.get("*", 1.0)
+        return qualities.get("*", 0.0)
+
+    candidates = [coding for coding in SNAPSHOT_ENCODINGS if coding in available and quality_of(coding) > 0]
+    if not candidates:
+        return "identity"
+    return max(candidates, key=lambda coding: (quality_of(coding), -SNAPSHOT_ENCODINGS.index(coding)))
+
+
+def etag_matches(if_none_match, etag):
+    """True if an If-None-Match header lists `etag` (or `*`); weak comparison, as RFC 9110 requires."""
+    if not if_none_match:
+        return False
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag == "*" or tag.removeprefix("W/").strip('"') == etag:
+            return True
+    return False
+
+
+def build_snapshot(docs):
+    """Serializes `docs` once and returns the stored form of the snapshot."""
+    body = dumps(docs).encode()
+    snapshot = {
+        "etag": hashlib.sha256(body).hexdigest()[:32],
+        "count": len(docs),
+        "size": len(body),
+        "gzip": Binary(gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)),
+    }
+    if brotli is not None:
+        snapshot["br"] = Binary(brotli.compress(body, quality=BROTLI_QUALITY))
+    return snapshot
+
+
+def publish_snapshots(db):
+    """
+    Materializes every slice from the hackathons collection (read once, in API
+    sort order) and replaces the stored snapshots. Run it before the generation
+    bump so APIs reload the new snapshots. Returns the number published.
+    """
+    docs = list(db.hackathons.find({}, public_projection()).sort([("start_date", 1), ("_id", 1)]))
+    published_at = datetime.now(timezone.utc)
+    today = _today()
+    names = []
+    for name, matches in snapshot_slices(today).items():
+        snapshot = build_snapshot([doc for doc in docs if matches(doc)])
+        snapshot["published_at"] = published_at
+        if name in DATED_SLICES:
+            snapshot["valid_on"] = today
+        db[SNAPSHOT_COLLECTION].replace_one({"_id": name}, snapshot, upsert=True)
+        names.append(name)
+        print(f"📦 Snapshot {name}: {snapshot['count']} hackathons, {snapshot['size']} bytes "
+              f"({len(snapshot['gzip'])} gzipped)")
+    db[SNAPSHOT_COLLECTION].delete_many({"_id": {"$nin": names}})
+    return len(names)
+
+
+class Snapshot:
+    """A published slice held in memory, one body per content coding."""
+
+    def __init__(self, stored):
+        self.etag = stored["etag"]
+        self.count = stored.get("count")
+        self.valid_on = stored.get("valid_on")
+        self.bodies = {"gzip": bytes(stored["gzip"])}
+        self.bodies["identity"] = gzip.decompress(self.bodies["gzip"])
+        if stored.get("br"):
+            self.bodies["br"] = bytes(stored["br"])
+
+    def is_current(self, today=None):
+        """False for a dated slice (see DATED_SLICES) once its publish date has passed."""
+        return self.valid_on is None or self.valid_on == (today or _today())
+
+    def etag_for(self, encoding):
+        """Strong ETags must differ per content coding, so the coding is part of the tag."""
+        return self.etag if encoding == "identity" else f"{self.etag}-{encoding}"
+
+    def reply(self, accept_encoding, if_none_match):
+        """
+        Returns (status, body, headers) for a request: the best accepted coding,
+        or an empty 304 when If-None-Match already holds that coding's ETag.
+        """
+        encoding = negotiate_encoding(accept_encoding, self.bodies)
+        etag = self.etag_for(encoding)
+        headers = {"ETag": f'"{etag}"', "Vary": "Accept-Encoding", "X-Snapshot": "HIT"}
+        if etag_matches(if_none_match, etag):
+            return 304, b"", headers
+        if encoding != "identity":
+            headers["Content-Encoding"] = encoding
+        return 200, self.bodies[encoding], headers
+
+
+def load_snapshots(db):
+    """Returns {slice name: Snapshot} for everything published."""
+    return {stored["_id"]: Snapshot(stored) for stored in db[SNAPSHOT_COLLECTION].find({})}
+
+
+class SnapshotStore:
+    """Lazily (re)loads the published snapshots from `load` after every invalidation."""
+
+    def __init__(self, load):
+        self.load = load
+        self._snapshots = None
+        self._lock = threading.Lock()
+
+    def invalidate(self):
+        self._snapshots = None
+
+    def get(self, name):
+        snapshots = self._snapshots
+        if snapshots is None:
+            with self._lock:
+                if self._snapshots is None:
+                    try:
+                        self._snapshots = self.load()
+                    except Exception as e:
+                        print(f"⚠️ Could not load snapshots, falling back to queries: {e}")
+                        return None
+                snapshots = self._snapshots
+        return snapshots.get(name)
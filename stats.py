@@ -0,0 +1,78 @@
+"""
+Dashboard aggregates served by /hackathons/stats.
+
+A single $facet aggregation over the (filtered) hackathons returns the total
+plus counts by mode, source, location and start month and prize-money
+buckets, so a dashboard gets its numbers without downloading the listing.
+The API caches the response until the next scrape run.
+"""
+
+# Lower bounds of the prize_money buckets; the last bucket is open-ended
+PRIZE_BOUNDARIES = (0, 1, 1000, 5000, 10000, 50000)
+OPEN_BUCKET = "open"
+
+# Locations beyond the most frequent ones are left out of `by_location`
+TOP_LOCATIONS = 50
+
+
+def _count_by(expression):
+    """$sortByCount with a stable order for ties (most frequent first, then by value)."""
+    return [{"$group": {"_id": expression, "count": {"$sum": 1}}}, {"$sort": {"count": -1, "_id": 1}}]
+
+
+def stats_pipeline(filters):
+    """The aggregation pipeline: `filters` (as for /hackathons/filter), then one $facet per aggregate."""
+    return [
+        {"$match": filters},
+        {"$facet": {
+            "total": [{"$count": "count"}],
+            "by_mode": _count_by("$mode"),
+            # merged hackathons count for every site they were found on
+            "by_source": [
+                {"$project": {"source": 1, "sources": 1}},
+                {"$unwind": {"path": "$sources", "preserveNullAndEmptyArrays": True}},
+                *_count_by({"$ifNull": ["$sources", "$source"]}),
+            ],
+            "by_location": [*_count_by("$location"), {"$limit": TOP_LOCATIONS}],
+            "by_month": [
+                # start_date is a BSON date (see scraper_utils.migrate_dates); missing dates group as null
+                {"$group": {"_id": {"$dateToString": {"format": "%Y-%m", "date": "$start_date"}},
+                            "count": {"$sum": 1}}},
+                {"$sort": {"_id": 1}},
+            ],
+            "prize_buckets": [{"$bucket": {
+                "groupBy": {"$ifNull": ["$prize_money", 0]},
+                "boundaries": list(PRIZE_BOUNDARIES),
+                "default": OPEN_BUCKET,     # prize_money >= the last boundary
+                "output": {"count": {"$sum": 1}},
+            }}],
+        }},
+    ]
+
+
+def _counts(rows):
+    return [{"value": row["_id"], "count": row["count"]} for row in rows]
+
+
+def _prize_buckets(rows):
+    """Every bucket (including empty ones) as {"min", "max", "count"}; `max` is None for the open-ended one."""
+    counts = {row["_id"]: row["count"] for row in rows}
+    buckets = []
+    for lower, upper in zip(PRIZE_BOUNDARIES, PRIZE_BOUNDARIES[1:] + (None,)):
+        key = lower if upper is not None else OPEN_BUCKET
+        buckets.append({"min": lower, "max": upper - 1 if upper is not None else None, "count": counts.get(key, 0)})
+    return buckets
+
+
+def shape_stats(result):
+    """Turns the aggregation result (a one-document list) into the response document."""
+    facets = result[0] if result else {}
+    total = facets.get("total") or [{"count": 0}]
+    return {
+        "total": total[0]["count"],
+        "by_mode": _counts(facets.get("by_mode", [])),
+        "by_source": _counts(facets.get("by_source", [])),
+        "by_location": _counts(facets.get("by_location", [])),
+        "by_month": _counts(facets.get("by_month", [])),
+        "prize_buckets": _prize_buckets(facets.get("prize_buckets", [])),
+    }
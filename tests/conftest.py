@@ -0,0 +1,51 @@
+"""
+Shared setup: every test runs against an in-memory MongoDB (mongomock), with
+the response cache off so API tests always reach the database.
+"""
+import os
+import sys
+from datetime import datetime, timedelta
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [ROOT, os.path.join(ROOT, "benchmarks")]
+
+os.environ["MONGO_URI"] = "mongomock://"
+os.environ["MONGO_DB"] = "hackathon_tests"
+os.environ["CACHE_MAX_ENTRIES"] = "0"
+os.environ.pop("SCRAPER_INCREMENTAL", None)
+os.environ.pop("SCRAPER_BACKEND", None)
+
+import fixtures  # noqa: E402
+from mongo_utils import get_client, get_db  # noqa: E402
+
+fixtures.patch_mongomock()
+
+
+@pytest.fixture
+def db():
+    """A fresh, empty hackathon database."""
+    get_client().drop_database(os.environ["MONGO_DB"])
+    return get_db()
+
+
+@pytest.fixture
+def make_hackathon():
+    """Builds a normalized hackathon document; keyword arguments override the defaults."""
+    def make(name="HackX", source="Devpost", day=1, **fields):
+        start = datetime(2027, 3, 1) + timedelta(days=day - 1)
+        slug = "".join(name.lower().split())
+        hackathon = {
+            "name": name,
+            "start_date": start,
+            "end_date": start + timedelta(days=2),
+            "mode": "Offline",
+            "location": "Boston, MA",
+            "prize_money": 1000,
+            "apply_link": f"https://{slug}.{source.lower()}.example",
+            "source": source,
+        }
+        hackathon.update(fields)
+        return hackathon
+    return make
@@ -0,0 +1,102 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+import snapshots
+from api_utils import FindPlan, decode_cursor, encode_cursor
+from mongo_utils import bump_generation
+
+
+@pytest.fixture
+def client(db):
+    import FlaskApi
+    FlaskApi.cache.clear()
+    FlaskApi.snapshots.invalidate()
+    return FlaskApi.app.test_client()
+
+
+def seed(db, count):
+    """`count` hackathons, three per start date, plus one without a date."""
+    db.hackathons.insert_many([{"name": f"Hack {i}", "start_date": datetime(2027, 1, 1) + timedelta(days=i // 3),
+                                "mode": "Online", "source": "Devpost"} for i in range(count)])
+    db.hackathons.insert_one({"name": "Undated", "start_date": None, "mode": "Online", "source": "MLH"})
+
+
+def test_cursor_round_trip(db):
+    seed(db, 1)
+    doc = db.hackathons.find_one({"start_date": {"$ne": None}})
+    assert decode_cursor(encode_cursor(doc)) == (doc["start_date"], doc["_id"])
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor")
+
+
+def test_keyset_pages_cover_every_row_once_in_order(db):
+    seed(db, 10)
+    expected = [doc["name"] for doc in db.hackathons.find().sort([("start_date", 1), ("_id", 1)])]
+
+    names, cursor, pages = [], None, 0
+    while True:
+        args = {"limit": "4", **({"cursor": cursor} if cursor else {})}
+        plan = FindPlan({}, args)
+        docs, cursor = plan.page(list(plan.find(db.hackathons)))
+        names += [doc["name"] for doc in docs]
+        pages += 1
+        if cursor is None:
+            break
+    assert names == expected
+    assert pages == 3
+
+
+def test_paging_keeps_the_filter(db):
+    seed(db, 10)
+    plan = FindPlan({"source": "MLH"}, {"limit": "1"})
+    docs, cursor = plan.page(list(plan.find(db.hackathons)))
+    assert [doc["name"] for doc in docs] == ["Undated"]
+    assert cursor is None
+
+
+def test_api_pages_through_next_cursor(client, db):
+    seed(db, 5)
+    response = client.get("/hackathons?limit=4")
+    assert response.status_code == 200
+    assert len(response.get_json()) == 4
+    assert 'rel="next"' in response.headers["Link"]
+
+    last = client.get(f"/hackathons?limit=4&cursor={response.headers['X-Next-Cursor']}")
+    assert len(last.get_json()) == 2
+    assert "X-Next-Cursor" not in last.headers
+
+
+def test_api_rejects_a_bad_cursor(client, db):
+    assert client.get("/hackathons?limit=4&cursor=bogus").status_code == 400
+
+
+def test_upcoming_snapshot_is_dated(db):
+    now = datetime.utcnow()
+    db.hackathons.insert_many([{"name": "Past", "start_date": now - timedelta(days=2)},
+                               {"name": "Soon", "start_date": now + timedelta(days=2)}])
+    snapshots.publish_snapshots(db)
+
+    loaded = snapshots.load_snapshots(db)
+    today = snapshots._today()
+    assert loaded["upcoming"].count == 1
+    assert loaded["upcoming"].is_current(today)
+    assert not loaded["upcoming"].is_current(today + timedelta(days=1))
+    assert loaded["all"].is_current(today + timedelta(days=1))
+
+
+def test_stale_upcoming_snapshot_falls_back_to_a_query(client, db, monkeypatch):
+    now = datetime.utcnow()
+    db.hackathons.insert_many([{"name": "Soon", "start_date": now + timedelta(days=1), "mode": "Online"},
+                               {"name": "Later", "start_date": now + timedelta(days=5), "mode": "Online"}])
+    snapshots.publish_snapshots(db)
+    bump_generation(db)
+
+    response = client.get("/hackathons?upcoming=1")
+    assert response.headers.get("X-Snapshot") == "HIT"
+
+    today = snapshots._today()
+    monkeypatch.setattr(snapshots, "_today", lambda: today + timedelta(days=2))
+    response = client.get("/hackathons?upcoming=1")
+    assert response.status_code == 200
+    assert "X-Snapshot" not in response.headers
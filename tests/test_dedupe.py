@@ -0,0 +1,117 @@
+import fixtures
+from dedupe import merge_hackathons
+from pipeline import collect, load_sources, scrape_and_store
+from run_benchmarks import replay
+from scraper_utils import ScrapeState, persist_merged
+
+
+def summary(db, source, hackathons, ok=True, complete=True):
+    """A run_source summary for `source`; `hackathons` None means not modified."""
+    state = ScrapeState.load(db, source) if ok else None
+    if state is not None:
+        state.complete = complete
+    return {"source": source, "ok": ok, "hackathons": hackathons, "state": state, "profile": None}
+
+
+def rows(db):
+    return {row["name"]: row for row in db.hackathons.find({}, {"_id": 0})}
+
+
+def test_same_event_on_two_sites_is_merged(make_hackathon):
+    devpost = make_hackathon("HackX", "Devpost", prize_money=500)
+    mlh = make_hackathon("HackX 2027", "MLH", prize_money=5000)
+
+    [merged] = merge_hackathons([mlh, devpost])
+    assert merged["source"] == "Devpost"
+    assert merged["name"] == "HackX"
+    assert merged["prize_money"] == 5000
+    assert merged["sources"] == ["Devpost", "MLH"]
+    assert merged["apply_links"] == {"Devpost": devpost["apply_link"], "MLH": mlh["apply_link"]}
+
+
+def test_different_dates_are_not_merged(make_hackathon):
+    assert len(merge_hackathons([make_hackathon("HackX", "Devpost"), make_hackathon("HackX", "MLH", day=20)])) == 2
+
+
+def test_listings_from_the_same_site_are_never_merged(make_hackathon):
+    first = make_hackathon("HackX 2026", "Devpost")
+    second = make_hackathon("HackX", "Devpost", day=2, apply_link="https://hackx2.devpost.example")
+    mlh = make_hackathon("HackX", "MLH", day=2)
+
+    merged = merge_hackathons([first, second, mlh])
+    assert len(merged) == 2
+    assert sorted(len(record["sources"]) for record in merged) == [1, 2]
+    # the closest listing (same day) is the one joined with MLH
+    [pair] = [record for record in merged if len(record["sources"]) == 2]
+    assert pair["apply_link"] == second["apply_link"]
+
+
+def test_online_event_does_not_take_a_venue(make_hackathon):
+    online = make_hackathon("HackX", "Devpost", mode="Online", location="")
+    offline = make_hackathon("HackX", "MLH", city="Boston", country="United States")
+
+    [merged] = merge_hackathons([online, offline])
+    assert merged["mode"] == "Online"
+    assert merged["location"] == ""
+    assert "city" not in merged
+
+
+def test_merged_rows_keep_links_of_a_source_that_was_not_modified(db, make_hackathon):
+    devpost, mlh = make_hackathon("HackX", "Devpost"), make_hackathon("HackX 2027", "MLH")
+    persist_merged(db, [summary(db, "Devpost", [devpost]), summary(db, "MLH", [mlh])])
+    assert rows(db)["HackX"]["sources"] == ["Devpost", "MLH"]
+
+    persist_merged(db, [summary(db, "Devpost", [devpost]), summary(db, "MLH", None)])
+    [row] = rows(db).values()
+    assert row["apply_links"] == {"Devpost": devpost["apply_link"], "MLH": mlh["apply_link"]}
+
+
+def test_merged_rows_survive_a_failed_source(db, make_hackathon):
+    devpost, mlh = make_hackathon("HackX", "Devpost"), make_hackathon("HackX 2027", "MLH")
+    persist_merged(db, [summary(db, "Devpost", [devpost]), summary(db, "MLH", [mlh])])
+
+    persist_merged(db, [summary(db, "Devpost", None, ok=False), summary(db, "MLH", [mlh])])
+    [row] = rows(db).values()
+    assert row["source"] == "Devpost"
+    assert row["sources"] == ["Devpost", "MLH"]
+
+
+def test_stored_row_is_replaced_when_another_site_lists_it(db, make_hackathon):
+    persist_merged(db, [summary(db, "MLH", [make_hackathon("HackY", "MLH")])])
+
+    devpost = make_hackathon("HackY", "Devpost")
+    persist_merged(db, [summary(db, "Devpost", [devpost]), summary(db, "MLH", None)])
+    [row] = rows(db).values()
+    assert row["source"] == "Devpost"
+    assert set(row["apply_links"]) == {"Devpost", "MLH"}
+
+
+def test_source_that_stopped_early_keeps_its_unseen_rows(db, make_hackathon):
+    old, mlh = make_hackathon("HackX", "Devpost"), make_hackathon("HackX 2027", "MLH")
+    persist_merged(db, [summary(db, "Devpost", [old]), summary(db, "MLH", [mlh])])
+
+    new = make_hackathon("Other", "Devpost", day=20)
+    persist_merged(db, [summary(db, "Devpost", [new], complete=False), summary(db, "MLH", [mlh])])
+    stored = rows(db)
+    assert set(stored) == {"HackX", "Other"}
+    assert stored["HackX"]["sources"] == ["Devpost", "MLH"]
+
+
+def test_standalone_run_merges_against_the_other_sources(db):
+    payloads = {"Devpost": fixtures.load_json("devpost_api.json"), "MLH": fixtures.load_text("mlh_season.html"),
+                "Devfolio": fixtures.load_json("devfolio_api.json")}
+    sources = load_sources()
+    summaries = []
+    for name, source in sources.items():
+        source.pages = replay(payloads[name])
+        hackathons, state = collect(source, db, threaded=False)
+        summaries.append({"source": name, "ok": True, "hackathons": hackathons, "state": state, "profile": None})
+    persist_merged(db, summaries, sources=list(sources))
+    stored = db.hackathons.count_documents({})
+    merged = db.hackathons.count_documents({"sources.1": {"$exists": True}})
+    assert merged > 0
+
+    db.scrape_state.drop()  # a full refresh of Devfolio alone
+    assert scrape_and_store(sources["Devfolio"], db) > 0
+    assert db.hackathons.count_documents({}) == stored
+    assert db.hackathons.count_documents({"sources.1": {"$exists": True}}) == merged
@@ -0,0 +1,95 @@
+import copy
+from datetime import datetime, timedelta
+
+import fixtures
+from pipeline import Collector, Pipeline, load_sources
+from scraper_utils import ScrapeState, content_hash, hackathon_key
+
+
+def devpost():
+    return load_sources()["Devpost"]
+
+
+def counting_pages(pages, fetched):
+    """A Source.pages replacement yielding `pages` in order and recording how many were fetched."""
+    def fetch(session, state):
+        for page in pages:
+            fetched.append(page)
+            yield copy.deepcopy(page)
+    return fetch
+
+
+def scrape(db, source, pages):
+    """Runs `source` over `pages` inline; returns (hackathons, state, pages fetched)."""
+    fetched = []
+    source.pages = counting_pages(pages, fetched)
+    state = ScrapeState.load(db, source.name)
+    hackathons = Pipeline(source, state, Collector()).run(threaded=False)
+    return hackathons, state, len(fetched)
+
+
+def test_first_run_is_a_full_refresh(db):
+    state = ScrapeState.load(db, "Devpost")
+    assert not state.incremental
+    assert not state.knows({"apply_link": "https://x.example"})
+
+
+def test_saved_state_knows_entries_and_their_content(db, make_hackathon):
+    hackathon = make_hackathon()
+    ScrapeState.load(db, "Devpost").save(db, [hackathon])
+
+    state = ScrapeState.load(db, "Devpost")
+    assert state.incremental
+    assert state.knows(hackathon, content=True)
+    changed = dict(hackathon, prize_money=5000)
+    assert state.knows(changed)
+    assert not state.knows(changed, content=True)
+    assert not state.knows_all([])
+
+
+def test_incremental_runs_can_be_disabled(db, make_hackathon, monkeypatch):
+    ScrapeState.load(db, "Devpost").save(db, [make_hackathon()])
+    monkeypatch.setenv("SCRAPER_INCREMENTAL", "0")
+    assert not ScrapeState.load(db, "Devpost").incremental
+
+
+def test_full_refresh_is_forced_after_the_refresh_window(db, make_hackathon):
+    ScrapeState.load(db, "Devpost").save(db, [make_hackathon()])
+    db.scrape_state.update_one({"_id": "Devpost"}, {"$set": {"last_full_run": datetime.utcnow() - timedelta(days=8)}})
+    assert not ScrapeState.load(db, "Devpost").incremental
+
+
+def test_partial_run_keeps_the_hashes_it_did_not_reach(db, make_hackathon):
+    first, second = make_hackathon("HackX"), make_hackathon("HackY")
+    ScrapeState.load(db, "Devpost").save(db, [first, second])
+
+    state = ScrapeState.load(db, "Devpost")
+    state.stop_early("test")
+    state.save(db, [dict(first, prize_money=5000)])
+
+    hashes = db.scrape_state.find_one({"_id": "Devpost"})["hashes"]
+    assert set(hashes) == {hackathon_key(first), hackathon_key(second)}
+    assert hashes[hackathon_key(first)] == content_hash(dict(first, prize_money=5000))
+
+
+def test_unchanged_page_stops_paging(db):
+    payload = fixtures.load_json("devpost_api.json")
+    hackathons, state, _ = scrape(db, devpost(), [payload])
+    state.save(db, hackathons)
+
+    again, state, fetched = scrape(db, devpost(), [payload] * 3)
+    assert fetched == 1
+    assert not state.complete
+    assert len(again) == len(hackathons)
+
+
+def test_changed_content_keeps_paging(db):
+    payload = fixtures.load_json("devpost_api.json")
+    hackathons, state, _ = scrape(db, devpost(), [payload])
+    state.save(db, hackathons)
+
+    changed = copy.deepcopy(payload)
+    changed["hackathons"][0]["prize_amount"] = "$<span>999,999</span>"
+    _, state, fetched = scrape(db, devpost(), [changed, payload, payload])
+    assert fetched == 2
+    assert not state.complete
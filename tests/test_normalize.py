@@ -0,0 +1,29 @@
+from datetime import date
+
+import pytest
+
+import normalize
+
+
+@pytest.mark.parametrize("text, today, expected", [
+    ("Jun 10th - 12th", date(2025, 11, 1), (date(2026, 6, 10), date(2026, 6, 12))),
+    ("Oct 25th - 27th", date(2025, 11, 1), (date(2025, 10, 25), date(2025, 10, 27))),
+    ("Dec 30th - Jan 2nd", date(2025, 11, 1), (date(2025, 12, 30), date(2026, 1, 2))),
+    ("Jan 10th - 12th", date(2025, 12, 20), (date(2026, 1, 10), date(2026, 1, 12))),
+    ("Feb 29th - Mar 1st", date(2025, 3, 1), (date(2028, 2, 29), date(2028, 3, 1))),
+])
+def test_mlh_year_is_the_next_occurrence(text, today, expected):
+    assert normalize.parse_mlh_date(text, today) == expected
+
+
+def test_mlh_event_running_for_a_while_keeps_its_year():
+    today = date(2025, 3, 20)
+    start, _ = normalize.parse_mlh_date("Mar 10th - 25th", today)
+    assert start == date(2025, 3, 10)
+    start, _ = normalize.parse_mlh_date("Mar 1st - 2nd", today)
+    assert start == date(2026, 3, 1)
+
+
+@pytest.mark.parametrize("text", ["", "TBA", "Smarch 3rd - 5th"])
+def test_unparseable_mlh_dates(text):
+    assert normalize.parse_mlh_date(text, date(2025, 1, 1)) == (None, None)
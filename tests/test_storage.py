@@ -0,0 +1,42 @@
+import geo
+from scraper_utils import migrate_locations, save_hackathons
+
+
+def test_unchanged_rows_are_not_rewritten(db, make_hackathon):
+    hackathons = [make_hackathon("HackX"), make_hackathon("HackY")]
+    assert save_hackathons(db.hackathons, hackathons, "Devpost")["upserted"] == 2
+
+    counts = save_hackathons(db.hackathons, hackathons + [make_hackathon("HackZ")], "Devpost")
+    assert (counts["upserted"], counts["modified"], counts["unchanged"]) == (1, 0, 2)
+
+
+def test_complete_scrape_reaps_vanished_rows(db, make_hackathon):
+    save_hackathons(db.hackathons, [make_hackathon("HackX"), make_hackathon("HackY")], "Devpost")
+    assert save_hackathons(db.hackathons, [make_hackathon("HackX")], "Devpost")["removed"] == 1
+    assert save_hackathons(db.hackathons, [], "Devpost", reap_stale=False)["removed"] == 0
+    assert db.hackathons.count_documents({}) == 1
+
+
+def test_rewritten_row_drops_fields_the_source_no_longer_has(db, make_hackathon):
+    offline = geo.geocode(make_hackathon(location="London, UK"))
+    assert "geo" in offline
+    save_hackathons(db.hackathons, [offline], "Devpost")
+
+    online = geo.geocode(make_hackathon(mode="Online", location="Everywhere"))
+    save_hackathons(db.hackathons, [online], "Devpost")
+    row = db.hackathons.find_one()
+    assert row["mode"] == "Online"
+    assert not {"city", "country", "geo"} & set(row)
+
+
+def test_migrate_locations_geocodes_and_clears(db):
+    db.hackathons.insert_many([
+        {"name": "Legacy", "location": "Paris, France"},
+        {"name": "Moved", "location": "Everywhere", "city": "London", "geo": geo.point(51.5, -0.1)},
+    ])
+    assert migrate_locations(db) == 2
+    rows = {row["name"]: row for row in db.hackathons.find()}
+    assert rows["Legacy"]["city"] == "Paris"
+    assert rows["Legacy"]["geo"]["type"] == "Point"
+    assert not {"city", "country", "geo"} & set(rows["Moved"])
+    assert migrate_locations(db) == 0